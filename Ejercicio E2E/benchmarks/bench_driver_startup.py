@@ -0,0 +1,39 @@
+# Benchmark: browser startup time with and without the driver resolution cache
+# Usage (from "Ejercicio E2E"): python -m benchmarks.bench_driver_startup [runs]
+import os
+import statistics
+import sys
+import tempfile
+import time
+from utils.driver_manager import DriverManager
+from utils.driver_cache import DriverResolutionCache
+
+def time_startups(runs, cache_path):
+    """Time setup_driver + quit_driver for a number of runs"""
+    timings = []
+    for _ in range(runs):
+        manager = DriverManager()
+        manager.resolution_cache = DriverResolutionCache(cache_path)
+        start = time.perf_counter()
+        manager.setup_driver(headless=True)
+        timings.append(time.perf_counter() - start)
+        manager.quit_driver()
+    return timings
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cache_path = os.path.join(tempfile.mkdtemp(), "driver_cache.json")
+    
+    uncached = time_startups(runs, "")
+    time_startups(1, cache_path)  # warm the cache
+    cached = time_startups(runs, cache_path)
+    
+    print("\n📊 DRIVER STARTUP (setup_driver)")
+    for name, timings in (("Sin caché", uncached), ("Con caché", cached)):
+        print(f"   • {name}: media {statistics.mean(timings):.2f}s, "
+              f"mediana {statistics.median(timings):.2f}s, mín {min(timings):.2f}s")
+    saved = statistics.mean(uncached) - statistics.mean(cached)
+    print(f"   ⚡ Ahorro por arranque: {saved:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# Micro-benchmarks of the framework's own cost, run against the bundled local store
+# so results are not affected by network noise. Fails when a primitive regresses past
+# benchmarks/baseline.json, which is recorded on the reference machine with
+# --update-baseline and committed (none is committed yet).
+# Usage (from "Ejercicio E2E"):
+#   python -m benchmarks.bench_primitives                    # compare with baseline
+#   python -m benchmarks.bench_primitives --update-baseline  # record a new baseline
+import argparse
+import json
+import os
+import sys
+import time
+from selenium.webdriver.common.by import By
+from local_store.server import LocalStore
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.home_page import HomePage
+from utils import settings
+from utils.driver_manager import BasePage, DriverManager
+from utils.stats import summarize
+from utils.store_api import CartSeeder, StoreApiClient
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Cart sizes for the CartPage.get_cart_items scaling benchmark
+CART_SIZES = (1, 10, 50)
+
+def measure(func, iterations):
+    """Run func repeatedly and return per-call times in milliseconds"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def bench_driver_lifecycle(iterations):
+    """setup_driver and quit_driver latency"""
+    setups, quits = [], []
+    for _ in range(iterations):
+        manager = DriverManager()
+        start = time.perf_counter()
+        manager.setup_driver(headless=True)
+        setups.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        manager.quit_driver()
+        quits.append((time.perf_counter() - start) * 1000)
+    return {"setup_driver": setups, "quit_driver": quits}
+
+def bench_base_page(driver, iterations):
+    """Per-call overhead of the BasePage primitives on a loaded page"""
+    home = HomePage(driver)
+    home.navigate_to_home()
+    page = BasePage(driver)
+    missing = (By.ID, "does-not-exist")
+    results = {
+        "wait_for_element": measure(lambda: page.wait_for_element(home.PHONES_CATEGORY), iterations),
+        "get_text": measure(lambda: page.get_text(home.PHONES_CATEGORY), iterations),
+        "scroll_to_element": measure(lambda: page.scroll_to_element(home.NEXT_BUTTON), iterations),
+        "click_element": measure(lambda: page.click_element(home.CATEGORIES_SECTION), iterations),
+        "is_element_present_absent": measure(lambda: page.is_element_present(missing), max(3, iterations // 10)),
+        "wait_for_page_ready": measure(home.wait_for_page_ready, iterations),
+    }
+    
+    cart = CartPage(driver)
+    checkout = CheckoutPage(driver)
+    cart.open_cart()
+    cart.proceed_to_checkout()
+    form = {
+        checkout.NAME_FIELD: "Benchmark", checkout.COUNTRY_FIELD: "Local",
+        checkout.CITY_FIELD: "Loopback", checkout.CREDIT_CARD_FIELD: "4111111111111111",
+        checkout.MONTH_FIELD: "12", checkout.YEAR_FIELD: "2030",
+    }
+    results["fill_form_batched"] = measure(lambda: page.fill_form(form, human_typing=False), iterations)
+    results["fill_form_typed"] = measure(lambda: page.fill_form(form, human_typing=True), max(3, iterations // 10))
+    return results
+
+def bench_cart_scaling(driver, iterations, seeder):
+    """CartPage.get_cart_items as the cart grows"""
+    cart = CartPage(driver)
+    results = {}
+    for size in CART_SIZES:
+        seeder.seed_cart(driver, ["Samsung galaxy s6"] * size)
+        cart.open_cart()
+        # get_cart_items reads the cart snapshot; refresh forces a new extraction every call
+        results[f"get_cart_items[{size}]"] = measure(lambda: cart.get_cart_snapshot(refresh=True), iterations)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Names of benchmarks whose p50 regressed past the baseline"""
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline.get(name)
+        if reference and stats["p50"] > reference["p50"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Framework micro-benchmarks")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--lifecycle-iterations", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    
+    # Without a baseline there is nothing to compare against: fail instead of passing silently
+    if not args.update_baseline and not os.path.exists(BASELINE_PATH):
+        print(f"❌ No baseline at {BASELINE_PATH}; record one with --update-baseline and commit it")
+        return 2
+    
+    store = LocalStore()
+    settings.BASE_URL = store.start()
+    settings.API_URL = store.api_url
+    
+    timings = bench_driver_lifecycle(args.lifecycle_iterations)
+    manager = DriverManager()
+    driver = manager.setup_driver(headless=True)
+    try:
+        timings.update(bench_base_page(driver, args.iterations))
+        timings.update(bench_cart_scaling(driver, args.iterations, CartSeeder(StoreApiClient())))
+    finally:
+        manager.quit_driver()
+        store.stop()
+    
+    results = {name: summarize(values) for name, values in timings.items()}
+    print("\n📊 FRAMEWORK MICRO-BENCHMARKS (ms)")
+    print(f"   {'benchmark':<28}{'n':>5}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for name, stats in results.items():
+        print(f"   {name:<28}{stats['count']:>5}{stats['p50']:>10.2f}{stats['p90']:>10.2f}{stats['p99']:>10.2f}")
+    
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"\n💾 Baseline saved: {BASELINE_PATH}")
+        return 0
+    
+    with open(BASELINE_PATH, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ Regressions past {args.tolerance:.0%} of baseline p50: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
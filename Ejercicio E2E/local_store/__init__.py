@@ -0,0 +1 @@
+# Empty __init__.py to make local_store a package
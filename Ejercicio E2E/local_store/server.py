@@ -0,0 +1,213 @@
+# Local stand-in for the demoblaze storefront: same pages, ids and backend endpoints,
+# served from memory with configurable latency so runs are hermetic and repeatable
+# Usage (from "Ejercicio E2E"): python -m local_store.server --port 8000 --latency-ms 50
+import argparse
+import json
+import mimetypes
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), "catalog.json")
+
+# Products per page behind the "Next" button
+PAGE_SIZE = 9
+
+PLACEHOLDER_IMAGE = """<svg xmlns="http://www.w3.org/2000/svg" width="300" height="200">
+<rect width="100%" height="100%" fill="#e9ecef"/>
+<text x="50%" y="50%" text-anchor="middle" fill="#6c757d" font-family="sans-serif">{label}</text>
+</svg>"""
+
+class StoreState:
+    """Catalog and carts kept in memory, shared by every request thread"""
+    
+    def __init__(self, catalog_path=CATALOG_PATH):
+        with open(catalog_path, encoding="utf-8") as catalog_file:
+            self.products = [
+                dict(product, img=f"imgs/{product['id']}.svg")
+                for product in json.load(catalog_file)
+            ]
+        self.carts = {}
+        self.lock = threading.Lock()
+    
+    def product(self, product_id):
+        for product in self.products:
+            if product["id"] == int(product_id):
+                return product
+        return None
+    
+    def page_after(self, last_id):
+        """Next page of products after the given id, with the key for the following one"""
+        items = [p for p in self.products if p["id"] > int(last_id)][:PAGE_SIZE]
+        page = {"Items": items}
+        if items and items[-1]["id"] < self.products[-1]["id"]:
+            page["LastEvaluatedKey"] = {"id": str(items[-1]["id"])}
+        return page
+    
+    def add_to_cart(self, cookie, row_id, product_id):
+        with self.lock:
+            self.carts.setdefault(cookie, []).append({"cookie": cookie, "id": row_id, "prod_id": int(product_id)})
+    
+    def view_cart(self, cookie):
+        with self.lock:
+            return list(self.carts.get(cookie, []))
+    
+    def delete_item(self, row_id):
+        with self.lock:
+            for cookie, rows in self.carts.items():
+                self.carts[cookie] = [row for row in rows if row["id"] != row_id]
+    
+    def delete_cart(self, cookie):
+        with self.lock:
+            self.carts.pop(cookie, None)
+
+class StoreRequestHandler(BaseHTTPRequestHandler):
+    """Serves the storefront pages and the /api/* backend endpoints"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    @property
+    def state(self):
+        return self.server.state
+    
+    def log_message(self, format, *args):
+        # Keep test output clean; the server is not what is being debugged
+        pass
+    
+    def _send(self, status, body=b"", content_type="application/json"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+    
+    def _send_json(self, payload):
+        self._send(200, json.dumps(payload))
+    
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+    
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/api/"):
+            self._handle_api(path[len("/api/"):], {})
+        elif path.startswith("/imgs/"):
+            label = os.path.splitext(os.path.basename(path))[0]
+            self._send(200, PLACEHOLDER_IMAGE.format(label=label), "image/svg+xml")
+        else:
+            self._serve_static(path)
+    
+    do_HEAD = do_GET
+    
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path.startswith("/api/"):
+            self._handle_api(path[len("/api/"):], self._read_json())
+        else:
+            self._send(405, '{"errorMessage": "Method not allowed"}')
+    
+    def _serve_static(self, path):
+        name = path.lstrip("/") or "index.html"
+        file_path = os.path.normpath(os.path.join(STATIC_DIR, name))
+        if not file_path.startswith(STATIC_DIR + os.sep) or not os.path.isfile(file_path):
+            self._send(404, "Not found", "text/plain")
+            return
+        with open(file_path, "rb") as static_file:
+            body = static_file.read()
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        self._send(200, body, content_type)
+    
+    def _handle_api(self, endpoint, payload):
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        
+        state = self.state
+        if endpoint == "entries":
+            self._send_json(state.page_after(0))
+        elif endpoint == "pagination":
+            self._send_json(state.page_after(payload.get("id", 0)))
+        elif endpoint == "bycat":
+            self._send_json({"Items": [p for p in state.products if p["cat"] == payload.get("cat")]})
+        elif endpoint == "view":
+            product = state.product(payload.get("id", 0))
+            if product is None:
+                self._send(404, '{"errorMessage": "Product not found"}')
+            else:
+                self._send_json(product)
+        elif endpoint == "addtocart":
+            state.add_to_cart(payload.get("cookie"), payload.get("id"), payload.get("prod_id"))
+            self._send(200)
+        elif endpoint == "viewcart":
+            self._send_json({"Items": state.view_cart(payload.get("cookie"))})
+        elif endpoint == "deleteitem":
+            state.delete_item(payload.get("id"))
+            self._send(200)
+        elif endpoint == "deletecart":
+            state.delete_cart(payload.get("cookie"))
+            self._send(200)
+        else:
+            self._send(404, '{"errorMessage": "Unknown endpoint"}')
+
+class StoreServer(ThreadingHTTPServer):
+    """Threaded server sized for many concurrent browser sessions"""
+    
+    daemon_threads = True
+    request_queue_size = 256
+
+class LocalStore:
+    """Runs the stand-in storefront in a background thread"""
+    
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0):
+        self.server = StoreServer((host, port), StoreRequestHandler)
+        self.server.state = StoreState()
+        self.server.latency_ms = latency_ms
+        self._thread = None
+    
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+    
+    @property
+    def api_url(self):
+        return f"{self.base_url}api"
+    
+    def start(self):
+        """Start serving and return the base URL"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local demoblaze stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every API call")
+    args = parser.parse_args()
+    
+    store = LocalStore(args.host, args.port, args.latency_ms)
+    print(f"🏪 Local store running at {store.base_url} (API: {store.api_url})")
+    try:
+        store.server.serve_forever()
+    except KeyboardInterrupt:
+        store.stop()
+
+if __name__ == "__main__":
+    main()
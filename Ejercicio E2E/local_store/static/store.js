@@ -0,0 +1,169 @@
+// Storefront scripts for the local demoblaze stand-in. Same page structure and backend
+// calls as the real site, talking to the /api endpoints of the local server.
+var API_URL = '/api';
+
+function getCookie(name) {
+    var match = document.cookie.match(new RegExp('(?:^|; )' + name + '=([^;]*)'));
+    return match ? decodeURIComponent(match[1]) : '';
+}
+
+function guid() {
+    return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function (c) {
+        var r = Math.random() * 16 | 0;
+        return (c === 'x' ? r : (r & 0x3 | 0x8)).toString(16);
+    });
+}
+
+// Anonymous carts are keyed on the "user" cookie
+if (!getCookie('user')) {
+    document.cookie = 'user=' + guid() + '; path=/';
+}
+
+function api(endpoint, payload, callback) {
+    var xhr = new XMLHttpRequest();
+    xhr.open(payload === undefined ? 'GET' : 'POST', API_URL + '/' + endpoint);
+    xhr.setRequestHeader('Content-Type', 'application/json');
+    xhr.onload = function () {
+        if (callback) {
+            callback(xhr.responseText ? JSON.parse(xhr.responseText) : null);
+        }
+    };
+    xhr.send(payload === undefined ? null : JSON.stringify(payload));
+}
+
+function escapeHtml(text) {
+    var div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+// Home: product grid, categories and pagination
+var lastKey = null;
+
+function renderProducts(items) {
+    var html = '';
+    items.forEach(function (product) {
+        html += '<div class="col-lg-4 col-md-6 mb-4"><div class="card h-100">' +
+            '<a href="prod.html?idp_=' + product.id + '"><img class="card-img-top img-fluid" src="' + product.img + '" alt=""></a>' +
+            '<div class="card-block"><h4 class="card-title"><a href="prod.html?idp_=' + product.id + '" class="hrefch">' +
+            escapeHtml(product.title) + '</a></h4><h5>$' + product.price + '</h5>' +
+            '<p class="card-text" id="article">' + escapeHtml(product.desc) + '</p></div></div></div>';
+    });
+    document.getElementById('tbodyid').innerHTML = html;
+}
+
+function showPagination(previous, next) {
+    document.getElementById('prev2').style.display = previous ? '' : 'none';
+    document.getElementById('next2').style.display = next ? '' : 'none';
+}
+
+function loadHome() {
+    api('entries', undefined, function (data) {
+        renderProducts(data.Items);
+        lastKey = data.LastEvaluatedKey ? data.LastEvaluatedKey.id : null;
+        showPagination(false, !!lastKey);
+    });
+}
+
+function nextPage() {
+    if (!lastKey) { return; }
+    api('pagination', {id: lastKey}, function (data) {
+        renderProducts(data.Items);
+        lastKey = data.LastEvaluatedKey ? data.LastEvaluatedKey.id : null;
+        showPagination(true, !!lastKey);
+    });
+}
+
+function previousPage() {
+    loadHome();
+}
+
+function byCat(category) {
+    api('bycat', {cat: category}, function (data) {
+        renderProducts(data.Items);
+        showPagination(false, false);
+    });
+    return false;
+}
+
+// Product detail
+function loadProduct() {
+    var id = new URLSearchParams(window.location.search).get('idp_');
+    api('view', {id: id}, function (product) {
+        document.getElementById('tbodyid').innerHTML =
+            '<div class="item active"><img src="' + product.img + '" alt=""></div>' +
+            '<h2 class="name">' + escapeHtml(product.title) + '</h2>' +
+            '<h3 class="price-container">$' + product.price + ' <small>*includes tax</small></h3>' +
+            '<div id="more-information"><strong>Product description</strong><p>' + escapeHtml(product.desc) + '</p></div>' +
+            '<a href="#" onclick="return addToCart(' + product.id + ')" class="btn btn-success btn-lg">Add to cart</a>';
+    });
+}
+
+function addToCart(productId) {
+    api('addtocart', {id: guid(), cookie: getCookie('user'), prod_id: productId, flag: false}, function () {
+        alert('Product added.');
+    });
+    return false;
+}
+
+// Cart and order
+var cartTotal = 0;
+
+function loadCart() {
+    var tbody = document.getElementById('tbodyid');
+    api('viewcart', {cookie: getCookie('user'), flag: false}, function (data) {
+        tbody.innerHTML = '';
+        cartTotal = 0;
+        document.getElementById('totalp').textContent = '';
+        data.Items.forEach(function (row) {
+            api('view', {id: row.prod_id}, function (product) {
+                var tr = document.createElement('tr');
+                tr.className = 'success';
+                tr.innerHTML = '<td><img width="100" src="' + product.img + '" alt=""></td>' +
+                    '<td>' + escapeHtml(product.title) + '</td><td>' + product.price + '</td>' +
+                    '<td><a href="#" onclick="return deleteItem(\'' + row.id + '\')">Delete</a></td>';
+                tbody.appendChild(tr);
+                cartTotal += product.price;
+                document.getElementById('totalp').textContent = cartTotal;
+            });
+        });
+    });
+}
+
+function deleteItem(rowId) {
+    api('deleteitem', {id: rowId}, loadCart);
+    return false;
+}
+
+function openOrderModal() {
+    document.getElementById('totalm').textContent = 'Total: ' + cartTotal;
+    document.getElementById('orderModal').style.display = 'block';
+}
+
+function closeOrderModal() {
+    document.getElementById('orderModal').style.display = 'none';
+}
+
+function purchaseOrder() {
+    var name = document.getElementById('name').value;
+    var card = document.getElementById('card').value;
+    if (!name || !card) {
+        alert('Please fill out Name and Creditcard.');
+        return;
+    }
+    api('deletecart', {cookie: getCookie('user')}, function () {
+        var now = new Date();
+        var details = 'Id: ' + Math.floor(Math.random() * 10000000) + '<br>Amount: ' + cartTotal + ' USD<br>' +
+            'Card Number: ' + escapeHtml(card) + '<br>Name: ' + escapeHtml(name) + '<br>Date: ' +
+            now.getDate() + '/' + now.getMonth() + '/' + now.getFullYear();
+        closeOrderModal();
+        var sweetAlert = document.createElement('div');
+        sweetAlert.className = 'sweet-alert showSweetAlert visible';
+        sweetAlert.innerHTML = '<h2>Thank you for your purchase!</h2><p class="lead text-muted">' + details + '</p>' +
+            '<div class="sa-button-container"><button class="confirm btn btn-lg btn-primary">OK</button></div>';
+        sweetAlert.querySelector('button.confirm').onclick = function () {
+            window.location.href = 'index.html';
+        };
+        document.body.appendChild(sweetAlert);
+    });
+}
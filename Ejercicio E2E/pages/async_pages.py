@@ -0,0 +1,174 @@
+# Async page objects for running many sessions on one event loop. Same locators and flow as
+# the synchronous page objects, without the per-action console logging (too noisy at scale).
+import asyncio
+from urllib.parse import urljoin
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from utils import settings
+from utils.async_driver import (
+    AsyncBasePage, any_of, dialog_shown, has_text, invisibility_of, presence_of,
+    settled, url_contains, visibility_of
+)
+from utils.catalog import PRODUCT_ID_PATTERN, get_catalog
+
+class AsyncHomePage(AsyncBasePage):
+    READY_CONDITIONS = (presence_of(HomePage.PRODUCT_CARDS), settled())
+    
+    async def navigate_to_home(self):
+        """Navigate to the home page"""
+        await self.open_url(settings.BASE_URL)
+        await self.wait_for_page_ready()
+    
+    async def _click_category(self, locator):
+        await self.click_element(locator)
+        await self.wait_for_page_ready()
+    
+    async def click_phones_category(self):
+        await self._click_category(HomePage.PHONES_CATEGORY)
+    
+    async def click_laptops_category(self):
+        await self._click_category(HomePage.LAPTOPS_CATEGORY)
+    
+    async def click_monitors_category(self):
+        await self._click_category(HomePage.MONITORS_CATEGORY)
+    
+    async def select_product(self, product_name):
+        """Open a product's detail page directly by its catalog URL"""
+        # The catalog is built once per process; building it blocks, so keep it off the loop
+        catalog = await asyncio.to_thread(get_catalog)
+        await self.open_url(catalog.lookup(product_name)["url"])
+        await self.wait_until(url_contains("prod.html"), settled())
+    
+    async def visible_products(self):
+        """Products of the current grid as {"id", "title", "price"}, read in one script call"""
+        snapshot = await self.extract_rows(HomePage.PRODUCT_CARDS, HomePage.PRODUCT_CARD_FIELDS)
+        products = []
+        for card in snapshot["rows"]:
+            match = PRODUCT_ID_PATTERN.search(card["link"] or "")
+            if match:
+                products.append({"id": int(match.group(1)), "title": card["title"], "price": card["price"]})
+        return products
+    
+    async def click_next_page(self):
+        if await self.is_element_visible(HomePage.NEXT_BUTTON):
+            await self.click_element(HomePage.NEXT_BUTTON)
+            await self.wait_for_page_ready()
+
+class AsyncProductPage(AsyncBasePage):
+    READY_CONDITIONS = (has_text(ProductPage.PRODUCT_NAME), settled())
+    
+    async def get_product_name(self):
+        return await self.get_text(ProductPage.PRODUCT_NAME)
+    
+    async def get_product_price(self):
+        return await self.get_text(ProductPage.PRODUCT_PRICE)
+    
+    async def add_to_cart(self):
+        """Add product to cart; returns whether the confirmation alert was received"""
+        await self.scroll_to_element(ProductPage.ADD_TO_CART_BUTTON)
+        await self.click_element(ProductPage.ADD_TO_CART_BUTTON)
+        return await self.wait_for_dialog("Product added") is not None
+    
+    async def go_back_to_home(self):
+        await self.click_element(ProductPage.HOME_LINK)
+        await self.wait_until(url_contains("prod.html", present=False), settled())
+
+class AsyncCartPage(AsyncBasePage):
+    READY_CONDITIONS = (url_contains("cart.html"), settled())
+    
+    def __init__(self, driver):
+        super().__init__(driver)
+        self._snapshot = None
+    
+    async def navigate_to_cart(self):
+        await self.click_element(CartPage.CART_LINK)
+        await self.wait_for_page_ready()
+        self._snapshot = None
+    
+    async def open_cart(self):
+        """Open the cart page directly by URL"""
+        await self.open_url(urljoin(settings.BASE_URL, "cart.html"))
+        await self.wait_for_page_ready()
+        self._snapshot = None
+    
+    async def get_cart_snapshot(self, refresh=False):
+        """Rows (name, price, row id) and total of the cart, read in a single script call"""
+        if self._snapshot is None or refresh:
+            raw = await self.extract_rows(CartPage.CART_ITEMS, CartPage.SNAPSHOT_FIELDS, CartPage.SNAPSHOT_EXTRAS)
+            rows = []
+            for row in raw["rows"]:
+                match = CartPage.ROW_ID_PATTERN.search(row.pop("delete") or "")
+                row["id"] = match.group(1) if match else None
+                rows.append(row)
+            self._snapshot = {"rows": rows, "total": raw.get("total") or ""}
+        return self._snapshot
+    
+    async def get_cart_items(self):
+        return [dict(row) for row in (await self.get_cart_snapshot())["rows"]]
+    
+    async def get_cart_items_count(self):
+        return len((await self.get_cart_snapshot())["rows"])
+    
+    async def get_total_price(self):
+        return (await self.get_cart_snapshot())["total"]
+    
+    async def delete_item(self, item_index=0):
+        """Delete an item from cart by index; returns False for an invalid index"""
+        items = await self.driver.find_elements(*CartPage.CART_ITEMS)
+        if item_index >= len(items):
+            return False
+        delete_btn = await items[item_index].find_element(*CartPage.DELETE_BUTTON)
+        await delete_btn.click()
+        await self.wait_for_page_ready()
+        self._snapshot = None
+        return True
+    
+    async def proceed_to_checkout(self):
+        await self.scroll_to_element(CartPage.PLACE_ORDER_BUTTON)
+        await self.click_element(CartPage.PLACE_ORDER_BUTTON)
+        await self.wait_until(visibility_of(CartPage.ORDER_MODAL_NAME_FIELD))
+    
+    async def is_cart_empty(self):
+        return await self.get_cart_items_count() == 0
+
+class AsyncCheckoutPage(AsyncBasePage):
+    READY_CONDITIONS = (visibility_of(CheckoutPage.NAME_FIELD),)
+    
+    async def fill_purchase_form(self, customer_data):
+        """Fill the purchase form in a single batch"""
+        await self.wait_for_page_ready()
+        await self.fill_form({
+            CheckoutPage.NAME_FIELD: customer_data['name'],
+            CheckoutPage.COUNTRY_FIELD: customer_data['country'],
+            CheckoutPage.CITY_FIELD: customer_data['city'],
+            CheckoutPage.CREDIT_CARD_FIELD: customer_data['card'],
+            CheckoutPage.MONTH_FIELD: customer_data['month'],
+            CheckoutPage.YEAR_FIELD: customer_data['year'],
+        })
+    
+    async def complete_purchase(self):
+        """Click Purchase and wait for the confirmation or the form's rejection alert"""
+        await self.click_element(CheckoutPage.PURCHASE_BUTTON)
+        await self.wait_until(any_of(
+            visibility_of(CheckoutPage.SUCCESS_MESSAGE),
+            dialog_shown(intercepted=settings.INTERCEPT_ALERTS, consume=False)
+        ))
+    
+    async def is_purchase_successful(self):
+        return await self.is_element_present(CheckoutPage.SUCCESS_MESSAGE, expect_present=True)
+    
+    async def get_success_message(self):
+        return await self.get_text(CheckoutPage.SUCCESS_MESSAGE)
+    
+    async def get_order_details(self):
+        return await self.get_text(CheckoutPage.ORDER_DETAILS)
+    
+    async def close_success_modal(self):
+        await self.click_element(CheckoutPage.OK_BUTTON)
+        await self.wait_until(invisibility_of(CheckoutPage.SUCCESS_MESSAGE))
+    
+    async def close_purchase_modal(self):
+        await self.click_element(CheckoutPage.CLOSE_BUTTON)
+        await self.wait_until(invisibility_of(CheckoutPage.PURCHASE_MODAL))
@@ -1,7 +1,12 @@
 # Page Object Model for Cart Page
+import re
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from urllib.parse import urljoin
 from utils.driver_manager import BasePage
-import time
+from utils import settings
+from utils.waits import page_settled
 
 class CartPage(BasePage):
     # Locators
@@ -12,34 +17,106 @@ class CartPage(BasePage):
     DELETE_BUTTON = (By.XPATH, ".//td[4]/a")
     TOTAL_PRICE = (By.ID, "totalp")
     PLACE_ORDER_BUTTON = (By.XPATH, "//button[contains(text(),'Place Order')]")
+    ORDER_MODAL_NAME_FIELD = (By.ID, "name")
+    
+    # Readiness: on the cart page with the cart requests finished and rows rendered
+    READY_CONDITIONS = (EC.url_contains("cart.html"), page_settled())
+    
+    # Bulk extraction: what to read from each cart row and from the page
+    SNAPSHOT_FIELDS = {
+        "name": (ITEM_NAME, "text"),
+        "price": (ITEM_PRICE, "text"),
+        "delete": (DELETE_BUTTON, "onclick"),
+    }
+    SNAPSHOT_EXTRAS = {"total": (TOTAL_PRICE, "text")}
+    ROW_ID_PATTERN = re.compile(r"deleteItem\('([^']+)'\)")
     
     def __init__(self, driver):
         super().__init__(driver)
+        self._snapshot = None
+        self._payload = None
+        self._network_mark = None
+    
+    def _mark_network(self):
+        """Remember where the capture is before (re)loading the cart; the payload is read after it"""
+        self._network_mark = self.network.mark() if self.network else None
+        self._payload = None
     
     def navigate_to_cart(self):
         """Navigate to cart page"""
         print("      → Haciendo clic en el enlace del carrito...")
+        self._mark_network()
         self.click_element(self.CART_LINK)
-        time.sleep(3)
+        self.wait_for_page_ready()
+        self.record_page_metrics("cart")
+        self._snapshot = None
         print("      → Página del carrito cargada")
     
+    def open_cart(self):
+        """Open the cart page directly by URL (e.g. after seeding it through the API)"""
+        url = urljoin(settings.BASE_URL, "cart.html")
+        print(f"      → Cargando URL: {url}")
+        self._mark_network()
+        self.open_url(url)
+        self.wait_for_page_ready()
+        self.record_page_metrics("cart")
+        self._snapshot = None
+        print("      → Página del carrito cargada")
+    
+    def get_cart_snapshot(self, refresh=False):
+        """
+        Rows (name, price, row id) and total of the cart, read in a single script call.
+        The snapshot is reused until the cart is reloaded or changed through this page object.
+        """
+        if self._snapshot is None or refresh:
+            with self.implicit_wait_disabled():
+                raw = self.extract_rows(self.CART_ITEMS, self.SNAPSHOT_FIELDS, self.SNAPSHOT_EXTRAS)
+            rows = []
+            for row in raw["rows"]:
+                match = self.ROW_ID_PATTERN.search(row.pop("delete") or "")
+                row["id"] = match.group(1) if match else None
+                rows.append(row)
+            self._snapshot = {"rows": rows, "total": raw.get("total") or ""}
+        return self._snapshot
+    
+    def get_cart_payload(self):
+        """
+        Cart as the backend sent it: the viewcart rows and, for each, the product from its
+        view response, with exact numeric prices. None when network capture is unavailable.
+        """
+        if self._payload is None and self._network_mark is not None:
+            print("      → Leyendo el carrito desde las respuestas del backend...")
+            viewcart = self._response_body("viewcart")
+            items = []
+            for row in viewcart.get("Items", []):
+                view = self._response_body(
+                    "view", lambda entry, prod_id=row["prod_id"]: str((entry["request"] or {}).get("id")) == str(prod_id)
+                )
+                items.append({"id": row["id"], "prod_id": row["prod_id"], "name": view["title"], "price": view["price"]})
+            self._payload = {"items": items, "total": sum(item["price"] for item in items)}
+            print(f"      → Carrito según el backend: {len(items)} productos, total ${self._payload['total']}")
+        return self._payload
+    
+    def _response_body(self, endpoint, match=None):
+        """JSON body of the first captured response of the endpoint since the mark that has one"""
+        # Bodies evicted from the browser's buffer are captured as None; those are skipped
+        readable = lambda entry: isinstance(entry["body"], dict) and (match is None or match(entry))
+        try:
+            return self.wait_for_response(endpoint, since=self._network_mark, match=readable)["body"]
+        except TimeoutException:
+            raise AssertionError(
+                f"No '{endpoint}' response with a readable JSON body was captured for the cart "
+                f"(bodies evicted from the browser's buffer are not available)"
+            )
+    
     def get_cart_items(self):
         """Get all items in cart"""
         print("      → Analizando productos en el carrito...")
         items = []
         try:
-            cart_rows = self.driver.find_elements(*self.CART_ITEMS)
-            for i, row in enumerate(cart_rows):
-                try:
-                    name = row.find_element(*self.ITEM_NAME).text
-                    price = row.find_element(*self.ITEM_PRICE).text
-                    items.append({
-                        'name': name,
-                        'price': price
-                    })
-                    print(f"        • Producto {i+1}: {name} - ${price}")
-                except:
-                    continue
+            for i, row in enumerate(self.get_cart_snapshot()["rows"]):
+                items.append(dict(row))
+                print(f"        • Producto {i+1}: {row['name']} - ${row['price']}")
         except:
             print("      → No se encontraron productos en el carrito")
         return items
@@ -47,8 +124,7 @@ class CartPage(BasePage):
     def get_cart_items_count(self):
         """Get number of items in cart"""
         try:
-            items = self.driver.find_elements(*self.CART_ITEMS)
-            count = len(items)
+            count = len(self.get_cart_snapshot()["rows"])
             print(f"      → Conteo de productos: {count}")
             return count
         except:
@@ -58,7 +134,7 @@ class CartPage(BasePage):
     def get_total_price(self):
         """Get total price from cart"""
         try:
-            total = self.get_text(self.TOTAL_PRICE)
+            total = self.get_cart_snapshot()["total"]
             print(f"      → Precio total calculado: ${total}")
             return total
         except:
@@ -68,11 +144,14 @@ class CartPage(BasePage):
     def delete_item(self, item_index=0):
         """Delete an item from cart by index"""
         print(f"      → Eliminando producto en posición {item_index}...")
-        items = self.driver.find_elements(*self.CART_ITEMS)
+        with self.implicit_wait_disabled():
+            items = self.driver.find_elements(*self.CART_ITEMS)
         if items and item_index < len(items):
             delete_btn = items[item_index].find_element(*self.DELETE_BUTTON)
+            self._mark_network()
             delete_btn.click()
-            time.sleep(2)
+            self.wait_for_page_ready()
+            self._snapshot = None
             print("      → Producto eliminado del carrito")
         else:
             print("      → No se pudo eliminar el producto (índice inválido)")
@@ -83,7 +162,7 @@ class CartPage(BasePage):
         self.scroll_to_element(self.PLACE_ORDER_BUTTON)
         print("      → Haciendo clic en 'Place Order'...")
         self.click_element(self.PLACE_ORDER_BUTTON)
-        time.sleep(2)
+        self.wait_until_ready(EC.visibility_of_element_located(self.ORDER_MODAL_NAME_FIELD))
         print("      → Formulario de checkout abierto")
     
     def is_cart_empty(self):
@@ -1,7 +1,9 @@
 # Page Object Model for Checkout Page
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from utils import settings
+from utils.dialogs import dialog_shown
 from utils.driver_manager import BasePage
-import time
 
 class CheckoutPage(BasePage):
     # Locators - Purchase Modal
@@ -21,35 +23,35 @@ class CheckoutPage(BasePage):
     ORDER_DETAILS = (By.XPATH, "//p[@class='lead text-muted']")
     OK_BUTTON = (By.XPATH, "//button[contains(text(),'OK')]")
     
+    # Readiness: purchase modal open and its fields interactable
+    READY_CONDITIONS = (EC.visibility_of_element_located(NAME_FIELD),)
+    
     def __init__(self, driver):
         super().__init__(driver)
     
-    def fill_purchase_form(self, customer_data):
+    def fill_purchase_form(self, customer_data, human_typing=None):
         """Fill the purchase form with customer data"""
         # Wait for modal to be visible
         print("      → Esperando que aparezca el modal de compra...")
-        self.wait_for_element(self.PURCHASE_MODAL)
-        time.sleep(1)
+        self.wait_for_page_ready()
         print("      → Modal de compra visible, llenando campos...")
         
-        # Fill form fields
         print(f"      → Ingresando nombre: {customer_data['name']}")
-        self.send_keys_to_element(self.NAME_FIELD, customer_data['name'])
-        
         print(f"      → Ingresando país: {customer_data['country']}")
-        self.send_keys_to_element(self.COUNTRY_FIELD, customer_data['country'])
-        
         print(f"      → Ingresando ciudad: {customer_data['city']}")
-        self.send_keys_to_element(self.CITY_FIELD, customer_data['city'])
-        
         print(f"      → Ingresando tarjeta: ****-****-****-{customer_data['card'][-4:]}")
-        self.send_keys_to_element(self.CREDIT_CARD_FIELD, customer_data['card'])
-        
         print(f"      → Ingresando mes: {customer_data['month']}")
-        self.send_keys_to_element(self.MONTH_FIELD, customer_data['month'])
-        
         print(f"      → Ingresando año: {customer_data['year']}")
-        self.send_keys_to_element(self.YEAR_FIELD, customer_data['year'])
+        
+        # Fill form fields in a single batch
+        self.fill_form({
+            self.NAME_FIELD: customer_data['name'],
+            self.COUNTRY_FIELD: customer_data['country'],
+            self.CITY_FIELD: customer_data['city'],
+            self.CREDIT_CARD_FIELD: customer_data['card'],
+            self.MONTH_FIELD: customer_data['month'],
+            self.YEAR_FIELD: customer_data['year'],
+        }, human_typing=human_typing)
         
         print("      → Todos los campos del formulario completados")
     
@@ -57,7 +59,11 @@ class CheckoutPage(BasePage):
         """Click the Purchase button to complete the order"""
         print("      → Haciendo clic en botón 'Purchase'...")
         self.click_element(self.PURCHASE_BUTTON)
-        time.sleep(3)
+        # Either the confirmation appears or the page rejects the form with an alert
+        self.wait_until_ready(EC.any_of(
+            EC.visibility_of_element_located(self.SUCCESS_MESSAGE),
+            dialog_shown(intercepted=settings.INTERCEPT_ALERTS, consume=False)
+        ))
         print("      → Orden procesada, esperando confirmación...")
     
     def is_purchase_successful(self):
@@ -96,7 +102,7 @@ class CheckoutPage(BasePage):
         try:
             print("      → Cerrando modal de éxito...")
             self.click_element(self.OK_BUTTON)
-            time.sleep(2)
+            self.wait_until_ready(EC.invisibility_of_element_located(self.SUCCESS_MESSAGE))
             print("      → Modal de éxito cerrado")
         except:
             print("      → Error al cerrar modal de éxito")
@@ -106,7 +112,7 @@ class CheckoutPage(BasePage):
         try:
             print("      → Cerrando modal de compra...")
             self.click_element(self.CLOSE_BUTTON)
-            time.sleep(2)
+            self.wait_until_ready(EC.invisibility_of_element_located(self.PURCHASE_MODAL))
             print("      → Modal de compra cerrado")
         except:
             print("      → Error al cerrar modal de compra")
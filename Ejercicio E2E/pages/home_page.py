@@ -1,7 +1,10 @@
 # Page Object Model for Home Page
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
 from utils.driver_manager import BasePage
-import time
+from utils import settings
+from utils.catalog import PRODUCT_ID_PATTERN, get_catalog
+from utils.waits import page_settled
 
 class HomePage(BasePage):
     # Locators
@@ -11,77 +14,109 @@ class HomePage(BasePage):
     LAPTOPS_CATEGORY = (By.XPATH, "//a[contains(text(),'Laptops')]")
     MONITORS_CATEGORY = (By.XPATH, "//a[contains(text(),'Monitors')]")
     
-    # Product links - using more specific selectors
-    SAMSUNG_GALAXY_S6 = (By.XPATH, "//a[contains(text(),'Samsung galaxy s6')]")
-    NOKIA_LUMIA_1520 = (By.XPATH, "//a[contains(text(),'Nokia lumia 1520')]")
-    SONY_VAIO_I5 = (By.XPATH, "//a[contains(text(),'Sony vaio i5')]")
-    MACBOOK_AIR = (By.XPATH, "//a[contains(text(),'MacBook air')]")
-    APPLE_MONITOR_24 = (By.XPATH, "//a[contains(text(),'Apple monitor 24')]")
-    
     # Navigation
     NEXT_BUTTON = (By.ID, "next2")
     PREVIOUS_BUTTON = (By.ID, "prev2")
     
+    # Readiness: product grid rendered and no catalog request in flight
+    PRODUCT_CARDS = (By.CSS_SELECTOR, "#tbodyid .card")
+    READY_CONDITIONS = (EC.presence_of_element_located(PRODUCT_CARDS), page_settled())
+    
+    # Catalog extraction from the product cards, and the backend category behind each link
+    PRODUCT_LINK = (By.CSS_SELECTOR, ".hrefch")
+    PRODUCT_CARD_FIELDS = {
+        "title": (PRODUCT_LINK, "text"),
+        "link": (PRODUCT_LINK, "href"),
+        "price": ((By.CSS_SELECTOR, "h5"), "text"),
+    }
+    CATEGORY_LINKS = {"phone": PHONES_CATEGORY, "notebook": LAPTOPS_CATEGORY, "monitor": MONITORS_CATEGORY}
+    
     def __init__(self, driver):
         super().__init__(driver)
-        self.url = "https://www.demoblaze.com/"
+        self.url = settings.BASE_URL
     
     def navigate_to_home(self):
         """Navigate to the home page"""
         print(f"      → Cargando URL: {self.url}")
-        self.driver.get(self.url)
-        time.sleep(2)
+        self.open_url(self.url)
         print("      → Esperando a que la página se cargue completamente...")
+        self.wait_for_page_ready()
+        self.record_page_metrics("home")
     
     def click_phones_category(self):
         """Click on Phones category"""
         print("      → Buscando categoría 'Phones'...")
         self.click_element(self.PHONES_CATEGORY)
-        time.sleep(2)
+        self.wait_for_page_ready()
+        self.record_page_metrics("category", in_page=True)
         print("      → Categoría 'Phones' seleccionada, cargando productos...")
     
     def click_laptops_category(self):
         """Click on Laptops category"""
         print("      → Buscando categoría 'Laptops'...")
         self.click_element(self.LAPTOPS_CATEGORY)
-        time.sleep(2)
+        self.wait_for_page_ready()
+        self.record_page_metrics("category", in_page=True)
         print("      → Categoría 'Laptops' seleccionada, cargando productos...")
     
     def click_monitors_category(self):
         """Click on Monitors category"""
         print("      → Buscando categoría 'Monitors'...")
         self.click_element(self.MONITORS_CATEGORY)
-        time.sleep(2)
+        self.wait_for_page_ready()
+        self.record_page_metrics("category", in_page=True)
         print("      → Categoría 'Monitors' seleccionada, cargando productos...")
     
     def select_product(self, product_name):
-        """Select a product by name"""
-        product_locators = {
-            "Samsung galaxy s6": self.SAMSUNG_GALAXY_S6,
-            "Nokia lumia 1520": self.NOKIA_LUMIA_1520,
-            "Sony vaio i5": self.SONY_VAIO_I5,
-            "MacBook air": self.MACBOOK_AIR,
-            "Apple monitor 24": self.APPLE_MONITOR_24
-        }
+        """Open a product's detail page directly by its catalog URL"""
+        product = get_catalog(home_page=self).lookup(product_name)
+        print(f"      → Abriendo '{product_name}' directamente: {product['url']}")
+        self.open_url(product["url"])
+        self.wait_until_ready(EC.url_contains("prod.html"), page_settled())
+        self.record_page_metrics("product")
+        print(f"      → Navegando a la página del producto '{product_name}'...")
+    
+    def _read_product_cards(self):
+        """Products shown on the current grid, read in one script call"""
+        products = []
+        for card in self.extract_rows(self.PRODUCT_CARDS, self.PRODUCT_CARD_FIELDS)["rows"]:
+            match = PRODUCT_ID_PATTERN.search(card["link"] or "")
+            if match:
+                price = (card["price"] or "").strip().lstrip("$")
+                products.append({"id": int(match.group(1)), "title": card["title"].strip(), "price": price or None})
+        return products
+    
+    def extract_catalog(self):
+        """Every product on the home page, across all pages behind "Next", with its category"""
+        print("      → Leyendo el catálogo desde la página principal...")
+        self.navigate_to_home()
+        products = {}
+        while True:
+            new_products = [p for p in self._read_product_cards() if p["id"] not in products]
+            products.update((p["id"], p) for p in new_products)
+            if not new_products or not self.is_element_visible(self.NEXT_BUTTON):
+                break
+            self.click_element(self.NEXT_BUTTON)
+            self.wait_for_page_ready()
         
-        if product_name in product_locators:
-            print(f"      → Buscando producto '{product_name}' en la página...")
-            self.scroll_to_element(product_locators[product_name])
-            print(f"      → Producto '{product_name}' encontrado, haciendo clic...")
-            self.click_element(product_locators[product_name])
-            time.sleep(2)
-            print(f"      → Navegando a la página del producto '{product_name}'...")
-        else:
-            raise ValueError(f"Product {product_name} not found in predefined products")
+        # The cards do not show the category: read each category's grid once
+        for category, locator in self.CATEGORY_LINKS.items():
+            self.click_element(locator)
+            self.wait_for_page_ready()
+            for card in self._read_product_cards():
+                if card["id"] in products:
+                    products[card["id"]]["cat"] = category
+        print(f"      → {len(products)} productos en el catálogo")
+        return list(products.values())
     
     def click_next_page(self):
         """Click next page button"""
-        if self.is_element_present(self.NEXT_BUTTON):
+        if self.is_element_visible(self.NEXT_BUTTON):
             self.click_element(self.NEXT_BUTTON)
-            time.sleep(2)
+            self.wait_for_page_ready()
     
     def click_previous_page(self):
         """Click previous page button"""
-        if self.is_element_present(self.PREVIOUS_BUTTON):
+        if self.is_element_visible(self.PREVIOUS_BUTTON):
             self.click_element(self.PREVIOUS_BUTTON)
-            time.sleep(2)
+            self.wait_for_page_ready()
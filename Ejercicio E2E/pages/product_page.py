@@ -1,7 +1,8 @@
 # Page Object Model for Product Page
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
 from utils.driver_manager import BasePage
-import time
+from utils.waits import element_has_text, page_settled
 
 class ProductPage(BasePage):
     # Locators
@@ -11,6 +12,9 @@ class ProductPage(BasePage):
     ADD_TO_CART_BUTTON = (By.XPATH, "//a[contains(text(),'Add to cart')]")
     HOME_LINK = (By.XPATH, "//a[contains(text(),'Home')]")
     
+    # Readiness: product details loaded
+    READY_CONDITIONS = (element_has_text(PRODUCT_NAME), page_settled())
+    
     def __init__(self, driver):
         super().__init__(driver)
     
@@ -34,19 +38,20 @@ class ProductPage(BasePage):
         self.scroll_to_element(self.ADD_TO_CART_BUTTON)
         print("      → Haciendo clic en 'Add to cart'...")
         self.click_element(self.ADD_TO_CART_BUTTON)
-        time.sleep(1)
         
-        # Handle the alert that appears after adding to cart
+        # The store confirms with an alert (read from the queue when alerts are intercepted)
         print("      → Esperando confirmación del sistema...")
-        if self.accept_alert():
-            print("      → ✅ Confirmación recibida: Producto agregado al carrito")
-            time.sleep(1)
+        message = self.wait_for_dialog("Product added")
+        if message is not None:
+            print(f"      → ✅ Confirmación recibida: {message}")
         else:
             print("      → ⚠️ No se recibió confirmación del sistema")
+        return message is not None
         
     def go_back_to_home(self):
         """Navigate back to home page"""
         print("      → Regresando a la página principal...")
         self.click_element(self.HOME_LINK)
-        time.sleep(2)
+        self.wait_until_ready(EC.none_of(EC.url_contains("prod.html")), page_settled())
+        self.record_page_metrics("home")
         print("      → De vuelta en la página principal")
@@ -1,10 +1,20 @@
 # Test execution script
+import argparse
 import subprocess
 import sys
 import os
+from utils.event_stream import EventMonitor
+from utils.html_report import read_results, render
+from utils.load_runner import run_load, run_load_async
+from utils.parallel_runner import default_worker_count, run_parallel
+from utils.run_history import RunHistory
 
-def run_tests():
-    """Run the E2E tests"""
+EVENTS_FILE = os.path.join("reports", "events.jsonl")
+OUTPUT_LOG = os.path.join("reports", "pytest_output.log")
+HTML_REPORT = os.path.join("reports", "report.html")
+
+def run_tests(raw_output=False):
+    """Run the E2E tests, streaming progress live; returns pytest's exit code"""
     
     print("🚀 Starting E2E Test Execution...")
     print("=" * 50)
@@ -12,33 +22,97 @@ def run_tests():
     # Create reports directory if it doesn't exist
     if not os.path.exists("reports"):
         os.makedirs("reports")
+    if os.path.exists(EVENTS_FILE):
+        os.remove(EVENTS_FILE)
     
+    monitor = EventMonitor([EVENTS_FILE], show_steps=True)
     try:
-        # Run pytest with HTML report
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", 
-            "tests/test_purchase_flow.py",
-            "-v",
-            "--html=reports/test_report.html",
-            "--self-contained-html"
-        ], capture_output=True, text=True)
-        
-        print("STDOUT:")
-        print(result.stdout)
-        
-        if result.stderr:
-            print("STDERR:")
-            print(result.stderr)
+        # Run pytest; its output is written line by line to the log (and the console
+        # with --raw) and results go to the event store the HTML report is rendered from
+        env = dict(os.environ, E2E_EVENTS_FILE=EVENTS_FILE)
+        with open(OUTPUT_LOG, "w", encoding="utf-8") as log_file:
+            process = subprocess.Popen([
+                sys.executable, "-m", "pytest",
+                "tests/test_purchase_flow.py",
+                "-v"
+            ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, env=env)
+            
+            monitor.start()
+            for line in process.stdout:
+                log_file.write(line)
+                if raw_output:
+                    print(line, end="", flush=True)
+            returncode = process.wait()
+        monitor.stop()
         
-        if result.returncode == 0:
+        print(f"\n⏱️ {monitor.summary()}")
+        if returncode == 0:
             print("✅ All tests passed!")
         else:
             print("❌ Some tests failed!")
             
-        print(f"\n📊 Test report generated: reports/test_report.html")
+        print(f"📄 Full pytest output: {OUTPUT_LOG}")
+        render([EVENTS_FILE], HTML_REPORT)
+        history = RunHistory()
+        history.record(read_results([EVENTS_FILE]))
+        history.save()
+        print(f"📊 Test report generated: {HTML_REPORT}")
+        return returncode
         
     except Exception as e:
         print(f"❌ Error running tests: {str(e)}")
+        return 1
+
+def run_tests_parallel(workers):
+    """Run the E2E tests sharded across worker processes, one browser per worker"""
+    
+    print("🚀 Starting parallel E2E Test Execution...")
+    print("=" * 50)
+    
+    return run_parallel(["tests/"], workers=workers)
+
+def worker_count(value):
+    """argparse type for --workers: 'auto' or a positive number of workers"""
+    if value == "auto":
+        return default_worker_count()
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        raise argparse.ArgumentTypeError(f"expected 'auto' or a positive integer, got '{value}'")
+    return workers
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run the Demoblaze E2E tests")
+    parser.add_argument(
+        "--workers", type=worker_count, default=None,
+        help="Number of parallel worker processes, or 'auto' for CPUs/RAM (default: serial run)"
+    )
+    parser.add_argument(
+        "--raw", action="store_true",
+        help="Also print pytest's own output live (it is always written to reports/pytest_output.log)"
+    )
+    parser.add_argument(
+        "--load", metavar="FILE", default=None,
+        help="Load mode: run one purchase flow per row of a CSV/JSONL file (e.g. data/load_flows.csv)"
+    )
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent browser sessions in load mode")
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="Load mode on the asyncio page objects: all sessions on one event loop and one chromedriver"
+    )
+    parser.add_argument("--flows", type=int, default=None, help="Stop the load run after this many flows")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    run_tests()
+    args = parse_args()
+    if args.load:
+        runner = run_load_async if args.use_async else run_load
+        report = runner(args.load, sessions=args.sessions, limit=args.flows)
+        sys.exit(1 if report["failed"] or not report["flows"] else 0)
+    elif args.workers is None:
+        sys.exit(run_tests(raw_output=args.raw))
+    else:
+        sys.exit(run_tests_parallel(args.workers))
@@ -0,0 +1,121 @@
+# Shared fixtures for the E2E suite
+import pytest
+from utils.browser_pool import BrowserPool
+from utils.store_api import CartSeeder, StoreApiClient
+from utils.catalog import get_catalog
+from utils import settings
+from utils.timing import tracer
+from utils.event_stream import EventStreamPlugin
+from utils.element_cache import ElementCache
+from utils.page_metrics import aggregate, check_budgets, current_target, format_summary, page_metrics, parse_budgets
+from utils.replay_proxy import ensure_proxy, set_scope, stop_proxy
+from local_store.server import LocalStore
+
+def pytest_configure(config):
+    """Point the suite at the bundled local store when E2E_LOCAL_STORE is set (and at the
+    record/replay proxy when E2E_PROXY is set) and stream run events when E2E_EVENTS_FILE is set"""
+    # A malformed budget fails the run before any test, not at the end of the session
+    try:
+        config._page_budgets = parse_budgets(settings.PAGE_BUDGETS)
+    except ValueError as e:
+        raise pytest.UsageError(f"E2E_PAGE_BUDGETS: {e}")
+    # Collecting only must not truncate the result store of the last real run
+    if settings.EVENTS_FILE and not config.option.collectonly:
+        config.pluginmanager.register(EventStreamPlugin(settings.EVENTS_FILE), "e2e-event-stream")
+    if settings.LOCAL_STORE:
+        store = LocalStore(latency_ms=settings.LOCAL_STORE_LATENCY_MS)
+        settings.BASE_URL = store.start()
+        settings.API_URL = store.api_url
+        config._local_store = store
+        print(f"🏪 Using local store at {settings.BASE_URL}")
+    ensure_proxy()
+
+def pytest_unconfigure(config):
+    stop_proxy()
+    store = getattr(config, "_local_store", None)
+    if store:
+        store.stop()
+
+def pytest_sessionfinish(session):
+    """Export the primitive/step timings collected during the run and check the page budgets"""
+    if tracer.enabled and tracer.steps:
+        trace_path = tracer.export()
+        print(f"\n⏱️ Timing trace: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+    budgets = getattr(session.config, "_page_budgets", None)
+    if budgets and page_metrics.records:
+        # Stand-ins (local store, replay proxy) answer in ~0 ms: their timings say nothing of the store
+        if current_target() != "live":
+            print(f"\n⚠️ Page budgets not checked: this run measured '{current_target()}', not the live store")
+            return
+        violations = check_budgets(aggregate(page_metrics.records), budgets)
+        for violation in violations:
+            print(f"❌ Page budget exceeded: {violation}")
+        if violations and session.exitstatus == 0:
+            session.exitstatus = 1
+
+def pytest_terminal_summary(terminalreporter):
+    """Show the slowest steps of the run and how often cached elements were reused"""
+    lookups = ElementCache.total_hits + ElementCache.total_misses
+    if lookups:
+        terminalreporter.write_line(
+            f"🔁 Element cache: {ElementCache.total_hits} hits / {ElementCache.total_misses} misses "
+            f"({ElementCache.hit_rate():.0%} of {lookups} lookups)"
+        )
+    if page_metrics.records:
+        terminalreporter.section(f"page metrics (ms, {current_target()}, {settings.NETWORK_PROFILE})")
+        for line in format_summary(aggregate(page_metrics.records)):
+            terminalreporter.write_line(line)
+    rows = sorted(tracer.summary(), key=lambda row: row["total"], reverse=True)[:5]
+    if not rows:
+        return
+    terminalreporter.section("slowest steps (ms)")
+    for row in rows:
+        terminalreporter.write_line(
+            f"{row['total']:>9} total | {row['wait']:>9} wait | {row['command']:>9} command | "
+            f"{row['test']} :: {row['step']}"
+        )
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Expose each phase's report on the item so fixtures can see test outcomes"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    """Browsers shared by every test of the session"""
+    pool = BrowserPool(headless=settings.HEADLESS)
+    yield pool
+    pool.close_all()
+
+@pytest.fixture(scope="session")
+def store_api():
+    """Pooled HTTP client for the store backend"""
+    client = StoreApiClient()
+    yield client
+    client.close()
+
+@pytest.fixture(scope="session")
+def cart_seeder(store_api):
+    """Seeds carts through the backend so tests can skip UI setup navigation"""
+    return CartSeeder(store_api)
+
+@pytest.fixture(scope="session")
+def catalog(store_api):
+    """Product index (name -> id, URL, category, price) built once for the session"""
+    return get_catalog(store_api)
+
+@pytest.fixture(autouse=True)
+def proxy_scope(request):
+    """File the test's requests under its own name in the record/replay proxy"""
+    set_scope(request.node.nodeid)
+    yield
+    set_scope("")
+
+@pytest.fixture(autouse=True)
+def trace_test(request):
+    """Group the timings of each test under its name"""
+    tracer.begin_test(request.node.name)
+    yield
+    tracer.end_test()
@@ -0,0 +1,69 @@
+# Unit tests for page metric records, aggregation and budgets (fake driver, no browser)
+import json
+import pytest
+from utils.page_metrics import PageMetrics, aggregate, check_budgets, parse_budgets, select
+
+class FakeDriver:
+    """Returns the given METRICS_SCRIPT results in order"""
+    
+    def __init__(self, *results):
+        self.results = list(results)
+    
+    def execute_script(self, script, *args):
+        return self.results.pop(0)
+
+def raw_metrics(page_ms, navigation=None):
+    return {"navigation": navigation, "paint": {}, "resources": 3, "api_calls": 1,
+            "resource_bytes": 100, "page_ms": page_ms, "url": "http://store/"}
+
+class TestBudgets:
+    
+    def test_parse_budgets_defaults_to_page_ms(self):
+        assert parse_budgets(["cart.p95=2500", " home.fcp_ms.p50 = 1500"]) == [
+            ("cart", "page_ms", "p95", 2500.0), ("home", "fcp_ms", "p50", 1500.0),
+        ]
+        assert parse_budgets([]) == []
+    
+    @pytest.mark.parametrize("spec", ["cart=2500", "cart.p95", "cart.p95=fast", "cart.p42=100",
+                                      "cart.weight.p95=1", "a.b.c.p95=1"])
+    def test_parse_budgets_rejects_malformed_specs(self, spec):
+        with pytest.raises(ValueError):
+            parse_budgets([spec])
+    
+    def test_check_budgets_reports_only_pages_over_their_limit(self):
+        records = [{"page": "cart", "page_ms": ms} for ms in (100, 200, 3000)] + [{"page": "home", "page_ms": 50}]
+        summary = aggregate(records)
+        budgets = parse_budgets(["cart.max=2500", "cart.p50=500", "home.p95=10", "product.p95=1"])
+        assert check_budgets(summary, budgets) == [
+            "cart page_ms max = 3000 (budget 2500)",
+            "home page_ms p95 = 50 (budget 10)",
+        ]
+
+class TestPageMetrics:
+    
+    def test_records_are_tagged_appended_to_the_file_and_capped_in_memory(self, tmp_path):
+        path = tmp_path / "metrics.jsonl"
+        metrics = PageMetrics(path=str(path), max_records=2)
+        driver = FakeDriver(raw_metrics(10.04, {"ttfb_ms": 5.0}), None, raw_metrics(20.0), raw_metrics(30.0))
+        assert metrics.record(driver, "home")["ttfb_ms"] == 5.0
+        assert metrics.record(driver, "category", in_page=True) is None
+        metrics.record(driver, "category", in_page=True)
+        metrics.record(driver, "cart")
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [record["page"] for record in lines] == ["home", "category", "cart"]
+        assert lines[0]["page_ms"] == 10.0 and lines[0]["navigation"] is True
+        assert [record["page"] for record in metrics.records] == ["category", "cart"]
+    
+    def test_disabled_without_a_path(self):
+        assert PageMetrics(path="").record(FakeDriver(raw_metrics(1.0)), "home") is None
+    
+    def test_select_keeps_one_target_and_profile(self):
+        records = [
+            {"page": "home", "target": "live", "profile": "lean"},
+            {"page": "home", "target": "live", "profile": "full"},
+            {"page": "home", "target": "local", "profile": "lean"},
+            {"page": "home"},
+        ]
+        assert select(records) == records[:2]
+        assert select(records, "live", "full") == [records[1]]
+        assert select(records, "local") == [records[2]]
@@ -1,7 +1,7 @@
 # E2E Test for Demoblaze Purchase Flow
 import pytest
 import time
-from utils.driver_manager import DriverManager
+from utils.timing import step
 from pages.home_page import HomePage
 from pages.product_page import ProductPage
 from pages.cart_page import CartPage
@@ -10,28 +10,42 @@ from pages.checkout_page import CheckoutPage
 class TestPurchaseFlow:
     
     @pytest.fixture(autouse=True)
-    def setup_and_teardown(self):
+    def setup_and_teardown(self, browser_pool, cart_seeder, request):
         """Setup and teardown for each test"""
-        # Setup
-        self.driver_manager = DriverManager()
-        self.driver = self.driver_manager.setup_driver()
+        # Setup: borrow a live browser from the session pool
+        self.driver_manager = browser_pool.acquire()
+        self.driver = self.driver_manager.driver
         
         # Initialize page objects
         self.home_page = HomePage(self.driver)
         self.product_page = ProductPage(self.driver)
         self.cart_page = CartPage(self.driver)
         self.checkout_page = CheckoutPage(self.driver)
+        self.cart_seeder = cart_seeder
         
         yield
         
-        # Teardown
-        self.driver_manager.quit_driver()
+        # Teardown: reset and return the browser, recycling it if the test failed
+        failed = any(
+            getattr(request.node, f"rep_{when}", None) is not None
+            and getattr(request.node, f"rep_{when}").failed
+            for when in ("setup", "call")
+        )
+        browser_pool.release(self.driver_manager, failed=failed)
+    
+    def seed_samsung(self):
+        """Shared prefix: Samsung galaxy s6 in the cart through the API, then the home page"""
+        self.cart_seeder.seed_cart(self.driver, ["Samsung galaxy s6"])
+        print("   • Navegando a la página principal...")
+        self.home_page.navigate_to_home()
     
     def test_complete_purchase_flow(self):
         """
-        Complete E2E test for purchase flow:
-        1. Navigate to home page
-        2. Add two products to cart
+        Complete E2E test for purchase flow. The first product is seeded through the
+        API; the second one is added through the UI, which
+        is the test's coverage of browsing a category and adding a product.
+        1. Start on the home page with one product in the cart
+        2. Add a second product through the UI
         3. View cart
         4. Complete purchase form
         5. Finalize purchase
@@ -41,32 +55,13 @@ class TestPurchaseFlow:
         print("🚀 INICIANDO FLUJO COMPLETO DE COMPRA E2E")
         print("="*80)
         
-        # Step 1: Navigate to home page
-        print("\n📍 PASO 1: NAVEGANDO A LA PÁGINA PRINCIPAL")
-        print("   • Accediendo a https://demoblaze.com...")
-        self.home_page.navigate_to_home()
-        print("   ✅ Página principal cargada exitosamente")
-        
-        # Step 2: Add first product (Samsung Galaxy S6)
-        print("\n🛒 PASO 2: AGREGANDO PRIMER PRODUCTO AL CARRITO")
-        print("   • Navegando a la categoría 'Phones'...")
-        self.home_page.click_phones_category()
-        print("   • Seleccionando producto 'Samsung Galaxy S6'...")
-        self.home_page.select_product("Samsung galaxy s6")
-        
-        # Verify we're on product page and add to cart
-        product_name_1 = self.product_page.get_product_name()
-        print(f"   • Producto seleccionado: {product_name_1}")
-        print("   • Agregando al carrito...")
-        self.product_page.add_to_cart()
-        print("   ✅ Primer producto agregado exitosamente")
-        
-        # Go back to home
-        print("   • Regresando a la página principal...")
-        self.product_page.go_back_to_home()
+        # Step 1: First product (Samsung Galaxy S6) in the cart, on the home page
+        step("🛒 PASO 1: PRIMER PRODUCTO EN EL CARRITO")
+        self.seed_samsung()
+        print("   ✅ Página principal cargada con el primer producto en el carrito")
         
-        # Step 3: Add second product (Nokia Lumia 1520)
-        print("\n🛒 PASO 3: AGREGANDO SEGUNDO PRODUCTO AL CARRITO")
+        # Step 2: Add second product (Nokia Lumia 1520) through the UI
+        step("🛒 PASO 2: AGREGANDO SEGUNDO PRODUCTO AL CARRITO")
         print("   • Navegando nuevamente a la categoría 'Phones'...")
         self.home_page.click_phones_category()
         print("   • Seleccionando producto 'Nokia Lumia 1520'...")
@@ -79,8 +74,8 @@ class TestPurchaseFlow:
         self.product_page.add_to_cart()
         print("   ✅ Segundo producto agregado exitosamente")
         
-        # Step 4: View cart
-        print("\n👁️ PASO 4: VISUALIZANDO EL CARRITO DE COMPRAS")
+        # Step 3: View cart
+        step("👁️ PASO 3: VISUALIZANDO EL CARRITO DE COMPRAS")
         print("   • Navegando al carrito...")
         self.cart_page.navigate_to_cart()
         
@@ -99,14 +94,22 @@ class TestPurchaseFlow:
         assert cart_count == 2, f"Expected 2 items in cart, but found {cart_count}"
         assert len(cart_items) == 2, f"Expected 2 items in cart list, but found {len(cart_items)}"
         
-        # Step 5: Proceed to checkout
-        print("\n💳 PASO 5: PROCEDIENDO AL CHECKOUT")
+        # Exact prices from the backend responses (when network capture is available)
+        cart_payload = self.cart_page.get_cart_payload()
+        if cart_payload is not None:
+            assert sorted(item["name"] for item in cart_payload["items"]) == sorted(item["name"] for item in cart_items), \
+                f"Cart rows {cart_items} do not match the backend cart {cart_payload['items']}"
+            assert float(total_price) == cart_payload["total"], \
+                f"Cart total ${total_price} does not match the backend total ${cart_payload['total']}"
+        
+        # Step 4: Proceed to checkout
+        step("💳 PASO 4: PROCEDIENDO AL CHECKOUT")
         print("   • Haciendo clic en 'Place Order'...")
         self.cart_page.proceed_to_checkout()
         print("   ✅ Modal de checkout abierto")
         
-        # Step 6: Fill purchase form
-        print("\n📝 PASO 6: COMPLETANDO FORMULARIO DE COMPRA")
+        # Step 5: Fill purchase form
+        step("📝 PASO 5: COMPLETANDO FORMULARIO DE COMPRA")
         customer_data = {
             'name': 'Juan Pérez',
             'country': 'México',
@@ -128,14 +131,14 @@ class TestPurchaseFlow:
         self.checkout_page.fill_purchase_form(customer_data)
         print("   ✅ Formulario completado exitosamente")
         
-        # Step 7: Complete purchase
-        print("\n🎯 PASO 7: FINALIZANDO LA COMPRA")
+        # Step 6: Complete purchase
+        step("🎯 PASO 6: FINALIZANDO LA COMPRA")
         print("   • Procesando el pago...")
         self.checkout_page.complete_purchase()
         print("   ✅ Compra procesada")
         
-        # Step 8: Verify purchase success
-        print("\n🔍 PASO 8: VERIFICANDO ÉXITO DE LA COMPRA")
+        # Step 7: Verify purchase success
+        step("🔍 PASO 7: VERIFICANDO ÉXITO DE LA COMPRA")
         print("   • Validando mensaje de confirmación...")
         assert self.checkout_page.is_purchase_successful(), "Purchase was not successful"
         
@@ -166,25 +169,16 @@ class TestPurchaseFlow:
         print("🧪 PRUEBA: AGREGAR Y REMOVER PRODUCTOS DEL CARRITO")
         print("="*80)
         
-        # Navigate to home and add a product
-        print("\n📍 NAVEGANDO A LA PÁGINA PRINCIPAL")
-        print("   • Accediendo a https://demoblaze.com...")
-        self.home_page.navigate_to_home()
-        print("   ✅ Página principal cargada")
-        
-        print("\n🛒 AGREGANDO PRODUCTO AL CARRITO")
-        print("   • Seleccionando categoría 'Phones'...")
-        self.home_page.click_phones_category()
-        print("   • Seleccionando producto 'Samsung Galaxy S6'...")
-        self.home_page.select_product("Samsung galaxy s6")
-        print("   • Agregando al carrito...")
-        self.product_page.add_to_cart()
+        # Same prefix as the purchase flow, seeded through the API
+        step("🛒 AGREGANDO PRODUCTO AL CARRITO")
+        print("   • Agregando 'Samsung Galaxy S6' al carrito (API)...")
+        self.seed_samsung()
         print("   ✅ Producto agregado exitosamente")
         
         # View cart
-        print("\n👁️ VERIFICANDO CARRITO")
-        print("   • Navegando al carrito...")
-        self.cart_page.navigate_to_cart()
+        step("👁️ VERIFICANDO CARRITO")
+        print("   • Abriendo el carrito...")
+        self.cart_page.open_cart()
         
         # Verify item was added
         initial_count = self.cart_page.get_cart_items_count()
@@ -193,7 +187,7 @@ class TestPurchaseFlow:
         print("   ✅ Producto verificado en el carrito")
         
         # Remove item
-        print("\n🗑️ REMOVIENDO PRODUCTO DEL CARRITO")
+        step("🗑️ REMOVIENDO PRODUCTO DEL CARRITO")
         print("   • Eliminando primer producto...")
         self.cart_page.delete_item(0)
         
@@ -215,15 +209,10 @@ class TestPurchaseFlow:
         print("🧪 PRUEBA: CHECKOUT CON CARRITO VACÍO")
         print("="*80)
         
-        # Navigate to home then to cart
-        print("\n📍 NAVEGANDO A LA PÁGINA PRINCIPAL")
-        print("   • Accediendo a https://demoblaze.com...")
-        self.home_page.navigate_to_home()
-        print("   ✅ Página principal cargada")
-        
-        print("\n🛒 VERIFICANDO CARRITO VACÍO")
-        print("   • Navegando al carrito...")
-        self.cart_page.navigate_to_cart()
+        # Go straight to the cart: a fresh browser has nothing in it
+        step("🛒 VERIFICANDO CARRITO VACÍO")
+        print("   • Abriendo el carrito...")
+        self.cart_page.open_cart()
         
         # Verify cart is empty
         print("   • Verificando que el carrito esté vacío...")
@@ -231,7 +220,7 @@ class TestPurchaseFlow:
         print("   ✅ Carrito confirmado como vacío")
         
         # Try to proceed to checkout - this should not work or should handle gracefully
-        print("\n💳 INTENTANDO CHECKOUT CON CARRITO VACÍO")
+        step("💳 INTENTANDO CHECKOUT CON CARRITO VACÍO")
         print("   • Intentando proceder al checkout...")
         try:
             self.cart_page.proceed_to_checkout()
@@ -246,6 +235,24 @@ class TestPurchaseFlow:
         print("🎉 ¡PRUEBA DE CARRITO VACÍO COMPLETADA!")
         print("="*80)
 
+    @pytest.mark.parametrize("product_name", ["Samsung galaxy s6", "Sony vaio i5", "Apple monitor 24"])
+    def test_product_page_matches_catalog(self, catalog, product_name):
+        """
+        Open products of each category directly by URL and check their details
+        against the catalog index
+        """
+        product = catalog.lookup(product_name)
+        
+        step(f"🔗 ABRIENDO '{product_name}' DESDE EL CATÁLOGO")
+        self.home_page.select_product(product_name)
+        
+        step("🔍 VERIFICANDO DETALLES DEL PRODUCTO")
+        name = self.product_page.get_product_name()
+        price = self.product_page.get_product_price()
+        assert name == product["name"], f"Expected product {product['name']}, but found {name}"
+        assert f"${product['price']:g}" in price, f"Expected price ${product['price']:g}, but found {price}"
+        print(f"   ✅ {name} ({product['category']}) coincide con el catálogo")
+
 if __name__ == "__main__":
     # Run tests directly
     pytest.main(["-v", __file__])
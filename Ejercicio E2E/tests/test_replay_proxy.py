@@ -0,0 +1,101 @@
+# Unit tests for the record/replay proxy's keys, archive and URL rewriting (no browser or network)
+import pytest
+from utils.replay_proxy import ReplayArchive, ReplayProxy, mask_ids, request_key
+
+CART_A = "0f8fad5b-d9cb-469f-a165-70867728950e"
+CART_B = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+
+def recorded_archive(tmp_path, exchanges):
+    """Archive recorded with the given (key, status, body) exchanges, loaded back for replay"""
+    archive = ReplayArchive(str(tmp_path / "store"))
+    archive.open_for_recording()
+    for key, status, body in exchanges:
+        archive.add(key, status, {"Content-Type": "text/plain"}, body)
+    archive.close()
+    replay = ReplayArchive(archive.path)
+    assert replay.load()
+    return replay
+
+class TestRequestKey:
+    
+    def test_mask_ids_numbers_ids_in_order_of_appearance(self):
+        labels = {}
+        assert mask_ids(f"/cart/{CART_B}?other={CART_A}&again={CART_B.upper()}", labels) == \
+            "/cart/<uuid-1>?other=<uuid-2>&again=<uuid-1>"
+        assert mask_ids(f"id={CART_A}", labels) == "id=<uuid-2>"
+    
+    def test_same_request_of_another_run_gets_the_same_key(self):
+        first = request_key("t::a", "POST", "/viewcart", f'{{"id": "{CART_A}", "cookie": "x"}}'.encode(), {})
+        second = request_key("t::a", "POST", "/viewcart", f'{{"cookie":"x","id":"{CART_B}"}}'.encode(), {})
+        assert first == second
+        assert first.startswith("t::a\tPOST /viewcart ")
+    
+    def test_scope_and_body_are_part_of_the_key(self):
+        assert request_key("t::a", "GET", "/", b"", {}) == "t::a\tGET / -"
+        assert request_key("t::b", "GET", "/", b"", {}) != request_key("t::a", "GET", "/", b"", {})
+        assert request_key("", "POST", "/entries", b'{"a": 1}', {}) != request_key("", "POST", "/entries", b'{"a": 2}', {})
+
+class TestReplayArchive:
+    
+    def test_repeated_requests_replay_in_order_then_repeat_the_last(self, tmp_path):
+        archive = recorded_archive(tmp_path, [
+            ("t::a\tPOST /viewcart -", 200, b"empty"),
+            ("t::a\tPOST /viewcart -", 200, b"one item"),
+        ])
+        bodies = [archive.next_response("t::a\tPOST /viewcart -")[2] for _ in range(3)]
+        assert bodies == [b"empty", b"one item", b"one item"]
+        archive.close()
+    
+    def test_identical_consecutive_responses_are_kept_once(self, tmp_path):
+        archive = recorded_archive(tmp_path, [
+            ("t::a\tGET /index.html -", 200, b"<html>"),
+            ("t::a\tGET /index.html -", 200, b"<html>"),
+            ("t::b\tGET /index.html -", 200, b"<html>"),
+        ])
+        assert len(archive.entries["t::a\tGET /index.html -"]) == 1
+        # The body is stored once in the data file whichever test recorded it
+        bodies = {tuple(response["body"]) for responses in archive.entries.values() for response in responses}
+        assert len(bodies) == 1
+        archive.close()
+    
+    def test_request_not_sent_by_the_test_falls_back_to_another_tests_response(self, tmp_path):
+        archive = recorded_archive(tmp_path, [
+            ("t::a\tGET /bm.png -", 200, b"png"),
+            ("t::b\tGET /bm.png -", 404, b"gone"),
+        ])
+        assert archive.next_response("t::c\tGET /bm.png -") == (200, {"Content-Type": "text/plain"}, b"png")
+        assert archive.next_response("t::c\tGET /missing -") is None
+        archive.close()
+    
+    def test_archive_of_another_version_is_not_loaded(self, tmp_path):
+        path = tmp_path / "store"
+        (tmp_path / "store.index.json").write_text('{"version": 1, "entries": {}}', encoding="utf-8")
+        assert not ReplayArchive(str(path)).load()
+        assert not ReplayArchive(str(tmp_path / "absent")).load()
+
+class TestRewrite:
+    
+    @pytest.fixture
+    def proxy(self, tmp_path):
+        proxy = ReplayProxy("record", str(tmp_path / "store"), "https://www.demoblaze.com/", "https://api.demoblaze.com")
+        yield proxy
+        proxy.server.server_close()
+    
+    def test_upstream_urls_point_at_the_proxy(self, proxy):
+        page = b'<script src="https://www.demoblaze.com/js/index.js"></script> fetch("https://api.demoblaze.com/entries")'
+        proxy_base = proxy.base_url.rstrip("/")
+        assert proxy.rewrite(page).decode() == (
+            f'<script src="{proxy_base}/js/index.js"></script> fetch("{proxy_base}/__api/entries")'
+        )
+    
+    def test_api_under_the_base_url_is_rewritten_first(self, tmp_path):
+        proxy = ReplayProxy("record", str(tmp_path / "store"), "http://127.0.0.1:9000/", "http://127.0.0.1:9000/api")
+        try:
+            proxy_base = proxy.base_url.rstrip("/")
+            assert proxy.rewrite(b"http://127.0.0.1:9000/api/view").decode() == f"{proxy_base}/__api/view"
+        finally:
+            proxy.server.server_close()
+    
+    def test_unknown_mode_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            ReplayProxy("live", str(tmp_path / "store"), "https://www.demoblaze.com/", "https://api.demoblaze.com")
@@ -0,0 +1,69 @@
+# Unit tests for the run history that orders and shards the suite (no browser needed)
+import json
+from utils import settings
+from utils.run_history import RunHistory
+
+def result(nodeid, duration, outcome="passed"):
+    return {"nodeid": nodeid, "duration": duration, "outcome": outcome}
+
+class TestRunHistory:
+    
+    def history(self, tmp_path, *runs):
+        """History stored under tmp_path with the given runs of test_end events recorded"""
+        history = RunHistory(path=str(tmp_path / "history.json"))
+        for run in runs:
+            history.record(run)
+        return history
+    
+    def test_record_averages_durations_and_skips_skipped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "HISTORY_ALPHA", 0.5)
+        history = self.history(tmp_path,
+                               [result("t::a", 10.0), result("t::b", 1.0, "skipped")],
+                               [result("t::a", 20.0)])
+        assert history.runs == 2
+        assert history.tests["t::a"]["duration"] == 15.0
+        assert history.tests["t::a"]["samples"] == 2
+        assert "t::b" not in history.tests
+    
+    def test_save_and_reload(self, tmp_path):
+        history = self.history(tmp_path, [result("t::a", 3.0, "failed")])
+        history.save()
+        reloaded = RunHistory(path=history.path)
+        assert reloaded.runs == 1
+        assert reloaded.tests == json.loads(json.dumps(history.tests))
+    
+    def test_unreadable_file_starts_empty(self, tmp_path):
+        path = tmp_path / "history.json"
+        path.write_text("{not json", encoding="utf-8")
+        history = RunHistory(path=str(path))
+        assert (history.runs, history.tests) == (0, {})
+    
+    def test_expected_duration_falls_back_to_siblings_then_median(self, tmp_path):
+        history = self.history(tmp_path, [result("t::x[1]", 2.0), result("t::x[2]", 4.0), result("t::y", 9.0)])
+        assert history.expected_duration("t::y") == 9.0
+        assert history.expected_duration("t::x[3]") == 3.0
+        assert history.expected_duration("t::new") == 4.0
+        assert RunHistory(path="").expected_duration("t::new") == 0.0
+    
+    def test_order_puts_recent_failures_first_then_longest(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "HISTORY_FAILED_RUNS", 2)
+        history = self.history(tmp_path,
+                               [result("t::old_failure", 1.0, "failed"), result("t::short", 2.0),
+                                result("t::long", 8.0), result("t::flaky", 0.5, "failed")],
+                               [result("t::old_failure", 1.0)],
+                               [result("t::flaky", 0.5, "failed")])
+        # old_failure failed 2 runs ago, which is outside the window of the last 2 runs
+        assert history.order(["t::short", "t::old_failure", "t::long", "t::flaky"]) == \
+            ["t::flaky", "t::long", "t::short", "t::old_failure"]
+    
+    def test_shard_gives_each_test_to_the_least_loaded_worker(self, tmp_path):
+        history = self.history(tmp_path, [result("t::a", 6.0), result("t::b", 4.0),
+                                          result("t::c", 3.0), result("t::d", 3.0)])
+        # Longest first (ties keep their order): a -> 0 (6), b -> 1 (4), c -> 1 (7), d -> 0 (9)
+        assert history.shard(["t::c", "t::a", "t::d", "t::b"], 2) == \
+            [(["t::a", "t::d"], 9.0), (["t::b", "t::c"], 7.0)]
+    
+    def test_shard_without_history_is_round_robin_and_drops_empty_shards(self, tmp_path):
+        history = self.history(tmp_path)
+        assert history.shard(["t::a", "t::b", "t::c"], 2) == [(["t::a", "t::c"], 0.0), (["t::b"], 0.0)]
+        assert history.shard(["t::a"], 3) == [(["t::a"], 0.0)]
@@ -0,0 +1,496 @@
+# Non-blocking WebDriver transport for asyncio: W3C WebDriver commands (and Chrome DevTools
+# commands through chromedriver's goog/cdp endpoint) over keep-alive HTTP connections built
+# on asyncio streams, so one event loop can drive many browser sessions from one process
+import asyncio
+import json
+import shutil
+from urllib.parse import urlparse
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, InvalidSessionIdException,
+    JavascriptException, NoAlertPresentException, NoSuchElementException,
+    StaleElementReferenceException, TimeoutException, UnexpectedAlertPresentException, WebDriverException
+)
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.by import By
+from webdriver_manager.chrome import ChromeDriverManager
+from utils import settings
+from utils.dialogs import DIALOG_HOOK_SCRIPT, TAKE_DIALOG
+from utils.dom_scripts import FILL_FORM, ROWS_SNAPSHOT, scriptable
+from utils.driver_cache import DriverResolutionCache
+from utils.driver_manager import DriverManager
+from utils.waits import INSTRUMENTATION_SCRIPT, _STATE_SCRIPT
+
+# W3C element reference key
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# W3C error codes mapped to the Selenium exceptions the page objects already handle
+ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "element click intercepted": ElementClickInterceptedException,
+    "element not interactable": ElementNotInteractableException,
+    "no such alert": NoAlertPresentException,
+    "unexpected alert open": UnexpectedAlertPresentException,
+    "javascript error": JavascriptException,
+    "invalid session id": InvalidSessionIdException,
+    "timeout": TimeoutException,
+    "script timeout": TimeoutException,
+}
+
+def _w3c_locator(by, value):
+    """Translate a Selenium locator to one of the W3C strategies"""
+    if by == By.ID:
+        return "css selector", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css selector", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css selector", f".{value}"
+    return by, value
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection; requests on it are serialized"""
+    
+    def __init__(self, url):
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+    
+    async def request(self, method, path, payload=None):
+        """Send a request and return (status, decoded JSON body)"""
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json;charset=UTF-8\r\nContent-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+        async with self._lock:
+            for attempt in range(2):
+                if self._writer is None:
+                    self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                self._writer.write(head + body)
+                await self._writer.drain()
+                status_line = await self._reader.readline()
+                if status_line:
+                    return await self._read_response(status_line)
+                # The server closed an idle keep-alive connection before reading the request
+                self.close()
+            raise ConnectionError(f"No response from {self.host}:{self.port}")
+    
+    async def _read_response(self, status_line):
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = b""
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if not size:
+                    break
+                data += chunk[:-2]
+        else:
+            data = await self._reader.readexactly(int(headers.get("content-length", 0)))
+        
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, json.loads(data) if data else None
+    
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+class AsyncElement:
+    """Reference to an element of an async session"""
+    
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+    
+    def _path(self, command=""):
+        return f"/element/{self.id}{command}"
+    
+    async def click(self):
+        await self.driver.execute("POST", self._path("/click"), {})
+    
+    async def clear(self):
+        await self.driver.execute("POST", self._path("/clear"), {})
+    
+    async def send_keys(self, text):
+        await self.driver.execute("POST", self._path("/value"), {"text": str(text)})
+    
+    async def text(self):
+        return await self.driver.execute("GET", self._path("/text"))
+    
+    async def is_displayed(self):
+        return await self.driver.execute("GET", self._path("/displayed"))
+    
+    async def attribute(self, name):
+        return await self.driver.execute("GET", self._path(f"/attribute/{name}"))
+    
+    async def find_element(self, by, value):
+        return await self.driver.find_element(by, value, parent=self)
+    
+    async def find_elements(self, by, value):
+        return await self.driver.find_elements(by, value, parent=self)
+
+class AsyncWebDriver:
+    """Minimal asyncio WebDriver session speaking the W3C protocol to a driver service"""
+    
+    def __init__(self, service_url):
+        self.service_url = service_url
+        self.session_id = None
+        self._connection = HttpConnection(service_url)
+    
+    async def start_session(self, capabilities):
+        status, response = await self._connection.request(
+            "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}}
+        )
+        value = self._check(status, response)
+        self.session_id = value["sessionId"]
+        return value.get("capabilities", {})
+    
+    def _check(self, status, response):
+        value = (response or {}).get("value")
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            if not isinstance(value, dict):
+                value = {"message": f"HTTP {status}: {value}"}
+            error = ERRORS.get(value.get("error"), WebDriverException)
+            if error is UnexpectedAlertPresentException:
+                # The text of the open dialog comes in the error data
+                raise error(value.get("message"), alert_text=(value.get("data") or {}).get("text"))
+            raise error(value.get("message", value.get("error")))
+        return value
+    
+    async def execute(self, method, path, payload=None):
+        """Run a command on this session and return its value"""
+        status, response = await self._connection.request(
+            method, f"/session/{self.session_id}{path}", payload
+        )
+        return self._check(status, response)
+    
+    async def quit(self):
+        if self.session_id:
+            try:
+                await self._connection.request("DELETE", f"/session/{self.session_id}")
+            finally:
+                self.session_id = None
+                self._connection.close()
+    
+    # Navigation
+    
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+    
+    async def current_url(self):
+        return await self.execute("GET", "/url")
+    
+    async def set_implicit_wait(self, seconds):
+        await self.execute("POST", "/timeouts", {"implicit": int(seconds * 1000)})
+    
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+    
+    # Elements
+    
+    async def find_element(self, by, value, parent=None):
+        using, selector = _w3c_locator(by, value)
+        prefix = parent._path() if parent else ""
+        found = await self.execute("POST", f"{prefix}/element", {"using": using, "value": selector})
+        return AsyncElement(self, found[ELEMENT_KEY])
+    
+    async def find_elements(self, by, value, parent=None):
+        using, selector = _w3c_locator(by, value)
+        prefix = parent._path() if parent else ""
+        found = await self.execute("POST", f"{prefix}/elements", {"using": using, "value": selector})
+        return [AsyncElement(self, item[ELEMENT_KEY]) for item in found]
+    
+    # Scripts, alerts and DevTools
+    
+    async def execute_script(self, script, *args):
+        args = [{ELEMENT_KEY: arg.id} if isinstance(arg, AsyncElement) else arg for arg in args]
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": args})
+    
+    async def alert_text(self):
+        return await self.execute("GET", "/alert/text")
+    
+    async def accept_alert(self):
+        await self.execute("POST", "/alert/accept", {})
+    
+    async def execute_cdp(self, cmd, params=None):
+        """Chrome DevTools command through chromedriver"""
+        return await self.execute("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params or {}})
+
+class AsyncDriverService:
+    """One chromedriver process serving every async session of the event loop"""
+    
+    def __init__(self, headless=True):
+        self.headless = headless
+        self.resolution_cache = DriverResolutionCache()
+        self.service = None
+    
+    def _driver_path(self):
+        cached = self.resolution_cache.lookup()
+        if cached and cached.get("browser") == "chrome" and cached.get("driver_path"):
+            return cached["driver_path"]
+        try:
+            return ChromeDriverManager().install()
+        except Exception:
+            # Fall back to chromedriver from the system PATH
+            return shutil.which("chromedriver")
+    
+    async def start(self):
+        """Start chromedriver (blocking work runs in a thread) and return its URL"""
+        path = await asyncio.to_thread(self._driver_path)
+        if not path:
+            raise WebDriverException("chromedriver not found (WebDriver Manager and system PATH)")
+        self.service = ChromeService(path)
+        await asyncio.to_thread(self.service.start)
+        print(f"🚀 Async driver service running at {self.service.service_url}")
+        return self.service.service_url
+    
+    async def new_session(self):
+        """Open a browser session configured like DriverManager's (options, waits, network profile)"""
+        manager = DriverManager()
+        # Nothing in async mode reads the DevTools log; left on, chromedriver would buffer
+        # every network event for the session's lifetime
+        options = manager.get_chrome_options(self.headless, performance_log=False)
+        driver = AsyncWebDriver(self.service.service_url)
+        await driver.start_session(options.to_capabilities())
+        await driver.set_implicit_wait(0)
+        await driver.execute_cdp("Page.addScriptToEvaluateOnNewDocument", {"source": INSTRUMENTATION_SCRIPT})
+        if settings.INTERCEPT_ALERTS:
+            await driver.execute_cdp("Page.addScriptToEvaluateOnNewDocument", {"source": DIALOG_HOOK_SCRIPT})
+        if manager.network_profile.active:
+            await driver.execute_cdp("Network.enable")
+            await driver.execute_cdp("Network.setBlockedURLs", {"urls": manager.network_profile.blocked_patterns})
+        return driver
+    
+    async def stop(self):
+        if self.service:
+            await asyncio.to_thread(self.service.stop)
+            self.service = None
+
+# Async readiness conditions: coroutines taking the driver, returning a truthy value when met
+
+def presence_of(locator):
+    async def condition(driver):
+        found = await driver.find_elements(*locator)
+        return found[0] if found else False
+    return condition
+
+def visibility_of(locator):
+    async def condition(driver):
+        for element in await driver.find_elements(*locator):
+            try:
+                if await element.is_displayed():
+                    return element
+            except StaleElementReferenceException:
+                return False
+        return False
+    return condition
+
+def invisibility_of(locator):
+    async def condition(driver):
+        return not await visibility_of(locator)(driver)
+    return condition
+
+def has_text(locator):
+    async def condition(driver):
+        element = await presence_of(locator)(driver)
+        try:
+            return element if element and (await element.text()).strip() else False
+        except StaleElementReferenceException:
+            return False
+    return condition
+
+def url_contains(text, present=True):
+    async def condition(driver):
+        return (text in await driver.current_url()) == present
+    return condition
+
+def alert_present():
+    async def condition(driver):
+        try:
+            return await driver.alert_text() is not None
+        except NoAlertPresentException:
+            return False
+    return condition
+
+def dialog_shown(contains=None, intercepted=True, consume=True):
+    """Next alert/confirm from the hook's queue, or the native alert (see dialogs.dialog_shown)"""
+    state = {"hooked": intercepted}
+    async def native_dialog(driver):
+        try:
+            message = await driver.alert_text()
+        except NoAlertPresentException:
+            return False
+        if contains and contains not in (message or ""):
+            return False
+        return {"type": "alert", "message": message, "native": True}
+    async def condition(driver):
+        if not state["hooked"]:
+            return await native_dialog(driver)
+        try:
+            dialog = await driver.execute_script(TAKE_DIALOG, contains, consume)
+        except UnexpectedAlertPresentException as e:
+            state["hooked"] = False
+            dialog = await native_dialog(driver)
+            if dialog or e.alert_text is None:
+                return dialog
+            if contains and contains not in e.alert_text:
+                return False
+            return {"type": "alert", "message": e.alert_text, "native": False}
+        if dialog is None:
+            state["hooked"] = False
+            return await native_dialog(driver)
+        return dict(dialog, native=False) if dialog else False
+    return condition
+
+def any_of(*conditions):
+    async def condition(driver):
+        for candidate in conditions:
+            result = await candidate(driver)
+            if result:
+                return result
+        return False
+    return condition
+
+def settled(quiet_ms=None):
+    """Network idle and DOM stable, like waits.page_settled"""
+    quiet_ms = settings.QUIET_MS if quiet_ms is None else quiet_ms
+    async def condition(driver):
+        try:
+            state = await driver.execute_script(_STATE_SCRIPT)
+        except WebDriverException:
+            return False
+        return bool(state) and state["readyState"] == "complete" and state["pending"] == 0 \
+            and state["sinceRequest"] >= quiet_ms and state["sinceMutation"] >= quiet_ms
+    return condition
+
+class AsyncBasePage:
+    """Async counterpart of BasePage: every WebDriver call yields to the event loop"""
+    
+    # Conditions that tell when this page is ready; page objects override them
+    READY_CONDITIONS = (settled(),)
+    
+    # Polling interval of waits; sessions waiting concurrently share the loop
+    POLL_INTERVAL = 0.05
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    async def wait_until(self, *conditions, timeout=None):
+        """Wait until every condition holds; returns the last condition's value"""
+        timeout = settings.WAIT_TIMEOUT if timeout is None else timeout
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            result = None
+            for condition in conditions:
+                try:
+                    result = await condition(self.driver)
+                except (NoSuchElementException, StaleElementReferenceException):
+                    result = False
+                if not result:
+                    break
+            if result:
+                return result
+            if asyncio.get_running_loop().time() >= deadline:
+                raise TimeoutException(f"Conditions not met within {timeout}s")
+            await asyncio.sleep(self.POLL_INTERVAL)
+    
+    async def probe(self, condition, expect_present=False):
+        """Evaluate a condition, waiting long only when a "yes" is expected; returns its value or None"""
+        timeout = settings.WAIT_TIMEOUT if expect_present else settings.PROBE_TIMEOUT
+        try:
+            return await self.wait_until(condition, timeout=timeout)
+        except TimeoutException:
+            return None
+    
+    async def wait_for_page_ready(self, timeout=None):
+        await self.wait_until(*self.READY_CONDITIONS, timeout=timeout)
+    
+    async def open_url(self, url):
+        await self.driver.get(url)
+    
+    async def click_element(self, locator):
+        """Click an element once it is visible"""
+        element = await self.wait_until(visibility_of(locator))
+        try:
+            await element.click()
+        except (StaleElementReferenceException, ElementClickInterceptedException, ElementNotInteractableException):
+            element = await self.wait_until(visibility_of(locator))
+            await element.click()
+    
+    async def send_keys_to_element(self, locator, text):
+        element = await self.wait_until(presence_of(locator))
+        await element.clear()
+        await element.send_keys(text)
+    
+    async def fill_form(self, values):
+        """Fill several fields from a {locator: value} mapping in one script call"""
+        if not scriptable(*values):
+            for locator, value in values.items():
+                await self.send_keys_to_element(locator, value)
+            return
+        missing = await self.driver.execute_script(FILL_FORM, [[locator, value] for locator, value in values.items()])
+        if missing:
+            raise NoSuchElementException(f"Form fields not found: {missing}")
+    
+    async def get_text(self, locator):
+        element = await self.wait_until(presence_of(locator))
+        return await element.text()
+    
+    async def extract_rows(self, row_locator, fields, extras=None):
+        """Read a table-like structure in one script call (see BasePage.extract_rows)"""
+        extras = extras or {}
+        locators = [row_locator] + [locator for locator, _ in fields.values()] + [locator for locator, _ in extras.values()]
+        if scriptable(*locators):
+            return await self.driver.execute_script(ROWS_SNAPSHOT, row_locator, fields, extras)
+        
+        async def read(root, locator, attribute):
+            found = await root.find_elements(*locator)
+            if not found:
+                return None
+            return (await found[0].text()).strip() if attribute == "text" else await found[0].attribute(attribute)
+        
+        snapshot = {"rows": []}
+        for row in await self.driver.find_elements(*row_locator):
+            snapshot["rows"].append({key: await read(row, locator, attribute) for key, (locator, attribute) in fields.items()})
+        for key, (locator, attribute) in extras.items():
+            snapshot[key] = await read(self.driver, locator, attribute)
+        return snapshot
+    
+    async def is_element_present(self, locator, expect_present=False):
+        return await self.probe(presence_of(locator), expect_present) is not None
+    
+    async def is_element_visible(self, locator, expect_present=False):
+        return await self.probe(visibility_of(locator), expect_present) is not None
+    
+    async def scroll_to_element(self, locator):
+        element = await self.wait_until(presence_of(locator))
+        await self.driver.execute_script(
+            "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", element
+        )
+    
+    async def wait_for_dialog(self, contains=None, expect_dialog=True):
+        """Message of the next alert/confirm (queued or native, accepted); None if none"""
+        dialog = await self.probe(dialog_shown(contains, settings.INTERCEPT_ALERTS), expect_present=expect_dialog)
+        if dialog is None:
+            return None
+        if dialog["native"]:
+            await self.driver.accept_alert()
+        return dialog["message"]
+    
+    async def accept_alert(self, expect_alert=True):
+        """Accept browser alert; only waits the full timeout when an alert is expected"""
+        return await self.wait_for_dialog(expect_dialog=expect_alert) is not None
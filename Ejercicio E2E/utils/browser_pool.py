@@ -0,0 +1,134 @@
+# Pool of live browsers reused across tests
+import atexit
+import threading
+import weakref
+from utils.driver_manager import DriverManager
+from utils.replay_proxy import scope_driver
+from utils import settings
+
+# Pools with browsers possibly still starting in the background; weak so the exit hook
+# does not keep finished pools alive
+_pools = weakref.WeakSet()
+
+@atexit.register
+def _quit_warm_browsers():
+    """Browsers still starting in the background must not outlive the interpreter"""
+    for pool in list(_pools):
+        pool._quit_warm()
+
+class BrowserPool:
+    """Hands out live browsers and resets them between tests instead of relaunching"""
+    
+    def __init__(self, headless=False, max_tests_per_browser=None, max_warm=None):
+        self.headless = headless
+        self.max_tests_per_browser = max_tests_per_browser or settings.MAX_TESTS_PER_BROWSER
+        self.max_warm = settings.WARM_BROWSERS if max_warm is None else max_warm
+        self._idle = []
+        self._warm = []
+        self._warm_slots = threading.BoundedSemaphore(self.max_warm) if self.max_warm > 0 else None
+        self._lock = threading.Lock()
+        self.launches = 0
+        self.reuses = 0
+        self.warm_hits = 0
+        _pools.add(self)
+    
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def acquire(self):
+        """Get a ready DriverManager, launching a browser only when none is idle or warm"""
+        with self._lock:
+            manager = self._idle.pop() if self._idle else None
+            warm = self._warm.pop(0) if manager is None and self._warm else None
+        
+        if manager is not None:
+            self._count("reuses")
+            print(f"♻️ Reusing {manager.browser_type} browser (test #{manager.tests_served + 1})")
+        elif warm is not None:
+            manager = self._take_warm(warm)
+        
+        if manager is None:
+            manager = DriverManager()
+            manager.setup_driver(headless=self.headless)
+            self._count("launches")
+        
+        # Requests of the test that borrows the browser are filed under its name by the proxy
+        scope_driver(manager.driver)
+        
+        # This browser is recycled after this test: start its replacement while the test runs
+        if manager.tests_served >= self.max_tests_per_browser - 1:
+            self.prewarm()
+        return manager
+    
+    def _take_warm(self, manager):
+        """A pre-warmed browser once it is up, or None if its background launch failed"""
+        try:
+            manager.wait_for_setup()
+        except Exception as e:
+            print(f"⚠️ Pre-warmed browser failed to start: {e}")
+            return None
+        finally:
+            self._warm_slots.release()
+        self._count("launches")
+        self._count("warm_hits")
+        print(f"🔥 Using pre-warmed {manager.browser_type} browser")
+        return manager
+    
+    def prewarm(self):
+        """
+        Start launching a browser in the background if a warm slot is free. Only done when a
+        browser is about to be recycled, so a spare never competes with a healthy run for CPU.
+        """
+        if self._warm_slots is None or not self._warm_slots.acquire(blocking=False):
+            return False
+        manager = DriverManager()
+        manager.setup_driver_in_background(headless=self.headless)
+        with self._lock:
+            self._warm.append(manager)
+        return True
+    
+    def release(self, manager, failed=False):
+        """Return a browser to the pool, recycling it after a failure or too many tests"""
+        manager.tests_served += 1
+        
+        if failed:
+            print("🔁 Test failed, recycling browser")
+            self.prewarm()
+            manager.quit_driver()
+            return
+        
+        if manager.tests_served >= self.max_tests_per_browser:
+            print(f"🔁 Browser served {manager.tests_served} tests, recycling")
+            manager.quit_driver()
+            return
+        
+        if not manager.reset_state():
+            self.prewarm()
+            manager.quit_driver()
+            return
+        
+        with self._lock:
+            self._idle.append(manager)
+    
+    def _quit_warm(self):
+        """Quit browsers launched in the background that no test used"""
+        with self._lock:
+            warm, self._warm = self._warm, []
+        for manager in warm:
+            try:
+                manager.wait_for_setup()
+            except Exception:
+                pass
+            finally:
+                self._warm_slots.release()
+            manager.quit_driver()
+    
+    def close_all(self):
+        """Quit every idle and pre-warmed browser"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for manager in idle:
+            manager.quit_driver()
+        self._quit_warm()
+        print(f"📊 Browser pool: {self.launches} launches ({self.warm_hits} pre-warmed), {self.reuses} reuses")
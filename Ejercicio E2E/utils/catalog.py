@@ -0,0 +1,87 @@
+# Catalog index: product name -> id, detail page URL, category and price, built once per
+# session from the store's listing endpoints (or the home page DOM) so any product can be
+# opened directly by URL
+import re
+import threading
+from urllib.parse import urljoin
+import requests
+from utils import settings
+from utils.store_api import StoreApiClient
+
+PRODUCT_ID_PATTERN = re.compile(r"idp_=(\d+)")
+
+def product_url(product_id, base_url=None):
+    """Detail page URL of a product"""
+    return urljoin(base_url or settings.BASE_URL, f"prod.html?idp_={product_id}")
+
+class CatalogIndex:
+    """Products of the store by name"""
+    
+    def __init__(self, products, base_url=None):
+        self._by_name = {}
+        for product in products:
+            entry = {
+                "id": int(product["id"]),
+                "name": product["title"],
+                "category": product.get("cat"),
+                "price": float(product["price"]) if product.get("price") is not None else None,
+                "url": product_url(product["id"], base_url),
+            }
+            self._by_name[entry["name"]] = entry
+    
+    def __len__(self):
+        return len(self._by_name)
+    
+    def __iter__(self):
+        return iter(self._by_name.values())
+    
+    def names(self):
+        return list(self._by_name)
+    
+    def lookup(self, product_name):
+        """Entry of a product by its title (exact match first, then case-insensitive)"""
+        entry = self._by_name.get(product_name)
+        if entry is None:
+            wanted = product_name.casefold()
+            entry = next((e for name, e in self._by_name.items() if name.casefold() == wanted), None)
+        if entry is None:
+            raise ValueError(f"Product {product_name} not found in store catalog")
+        return entry
+    
+    def by_category(self, category):
+        return [entry for entry in self if entry["category"] == category]
+    
+    @classmethod
+    def from_api(cls, client):
+        """Build from the listing endpoints (entries + pagination)"""
+        return cls(client.list_products())
+    
+    @classmethod
+    def from_home_page(cls, home_page):
+        """Build from the product cards of every page behind "Next" and every category"""
+        return cls(home_page.extract_catalog())
+
+# One index per session (process), shared by every page object and load-runner thread
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_catalog(client=None, home_page=None):
+    """Session catalog, built on first use from the API, or from the home page if the API is unreachable"""
+    global _shared
+    if _shared is not None:
+        return _shared
+    with _shared_lock:
+        if _shared is None:
+            own_client = client is None
+            client = client or StoreApiClient()
+            try:
+                _shared = CatalogIndex.from_api(client)
+            except requests.RequestException:
+                if home_page is None:
+                    raise
+                print("      → ⚠️ API del catálogo no disponible, leyendo productos desde la página...")
+                _shared = CatalogIndex.from_home_page(home_page)
+            finally:
+                if own_client:
+                    client.close()
+    return _shared
@@ -0,0 +1,41 @@
+# Reader for the browser's DevTools performance log. The log can only be read once,
+# so a single reader per browser drains it and dispatches events to every subscriber.
+import json
+from selenium.common.exceptions import WebDriverException
+
+def enable_performance_log(options):
+    """Ask a Chromium-based browser to record DevTools network/page events"""
+    # "goog:chromeOptions" -> "goog:loggingPrefs", "ms:edgeOptions" -> "ms:loggingPrefs"
+    vendor = options.KEY.split(":")[0]
+    options.set_capability(f"{vendor}:loggingPrefs", {"performance": "ALL"})
+
+class PerformanceLog:
+    """Drains DevTools events from the driver and hands them to subscribers by method name"""
+    
+    def __init__(self):
+        self._subscribers = {}
+    
+    def subscribe(self, methods, callback):
+        """Call callback(method, params) for every event whose method is in methods"""
+        for method in methods:
+            self._subscribers.setdefault(method, []).append(callback)
+    
+    def drain(self, driver):
+        """Read pending events and dispatch them; returns how many were dispatched"""
+        if not self._subscribers or driver is None:
+            return 0
+        try:
+            entries = driver.get_log("performance")
+        except (WebDriverException, ValueError):
+            return 0
+        
+        dispatched = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            for callback in self._subscribers.get(message.get("method"), ()):
+                callback(message["method"], message.get("params", {}))
+                dispatched += 1
+        return dispatched
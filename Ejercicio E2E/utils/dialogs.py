@@ -0,0 +1,89 @@
+# Alert interception: a hook installed before page scripts run replaces window.alert and
+# window.confirm with functions that record the message in a queue, so page objects read
+# "Product added." with one script call instead of waiting for a blocking native dialog.
+# Native alert handling stays as the fallback when the hook is off or not installed.
+from selenium.common.exceptions import NoAlertPresentException, UnexpectedAlertPresentException, WebDriverException
+
+# confirm() answers window.__e2eConfirmAnswer (true unless a test changes it)
+DIALOG_HOOK_SCRIPT = """
+(function () {
+    if (window.__e2eDialogs) { return; }
+    var queue = window.__e2eDialogs = [];
+    window.__e2eConfirmAnswer = true;
+    var record = function (type, message) {
+        queue.push({type: type, message: message === undefined ? '' : String(message), ts: Date.now()});
+    };
+    window.alert = function (message) { record('alert', message); };
+    window.confirm = function (message) { record('confirm', message); return window.__e2eConfirmAnswer; };
+})();
+"""
+
+# First queued dialog containing arguments[0] (any when empty), removed from the queue when
+# arguments[1] is true; null when the hook is not installed on this document
+TAKE_DIALOG = """
+var queue = window.__e2eDialogs, text = arguments[0], consume = arguments[1];
+if (!queue) { return null; }
+for (var i = 0; i < queue.length; i++) {
+    if (!text || queue[i].message.indexOf(text) !== -1) {
+        return consume ? queue.splice(i, 1)[0] : queue[i];
+    }
+}
+return false;
+"""
+
+def keep_unhandled_prompts(options):
+    """
+    Leave unexpected native dialogs open instead of letting the driver dismiss them (which
+    answers confirm() with Cancel), so the native fallback can read and accept them
+    """
+    options.unhandled_prompt_behavior = "ignore"
+
+def install_dialog_hook(driver):
+    """Register the dialog hook to run before page scripts on every new document"""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DIALOG_HOOK_SCRIPT})
+        return True
+    except (AttributeError, WebDriverException):
+        return False
+
+def dialog_shown(contains=None, intercepted=True, consume=True):
+    """
+    Condition: the next alert/confirm whose message contains the text, as a dict with type,
+    message and native. Reads the hook's queue while it is installed on the page, otherwise
+    the native alert, which is left open for the caller (native=True) to accept.
+    """
+    state = {"hooked": intercepted}
+    
+    def native_dialog(driver):
+        try:
+            alert = driver.switch_to.alert
+            message = alert.text
+        except NoAlertPresentException:
+            return False
+        if contains and contains not in (message or ""):
+            return False
+        return {"type": "alert", "message": message, "native": True}
+    
+    def condition(driver):
+        if not state["hooked"]:
+            return native_dialog(driver)
+        try:
+            dialog = driver.execute_script(TAKE_DIALOG, contains, consume)
+        except UnexpectedAlertPresentException as e:
+            # A native alert beat the hook (the page loaded before it was installed). With
+            # unhandledPromptBehavior "ignore" it is still open for the native fallback; if
+            # the driver closed it anyway, only its text is left to check
+            state["hooked"] = False
+            dialog = native_dialog(driver)
+            if dialog or e.alert_text is None:
+                return dialog
+            if contains and contains not in e.alert_text:
+                return False
+            return {"type": "alert", "message": e.alert_text, "native": False}
+        except WebDriverException:
+            return False
+        if dialog is None:
+            state["hooked"] = False
+            return native_dialog(driver)
+        return dict(dialog, native=False) if dialog else False
+    return condition
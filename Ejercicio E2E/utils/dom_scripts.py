@@ -0,0 +1,69 @@
+# JavaScript helpers that resolve Selenium locators inside the page, so page objects
+# can read or write many elements in a single WebDriver round trip
+
+# Locator strategies the scripts resolve in the page; link-text locators depend on
+# WebDriver's rendered-text rules, so page objects resolve those through the driver instead
+SCRIPT_STRATEGIES = ("xpath", "id", "name", "class name", "tag name", "css selector")
+
+def scriptable(*locators):
+    """True if every locator can be resolved inside the page by FIND_ALL"""
+    return all(locator[0] in SCRIPT_STRATEGIES for locator in locators)
+
+# Resolves a [by, value] locator (as serialized from a Selenium tuple) relative to a root node
+FIND_ALL = """
+var findAll = function (root, locator) {
+    var by = locator[0], value = locator[1];
+    if (by === 'xpath') {
+        var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+        return nodes;
+    }
+    if (by === 'id') { value = '[id="' + value + '"]'; }
+    else if (by === 'name') { value = '[name="' + value + '"]'; }
+    else if (by === 'class name') { value = '.' + value; }
+    else if (by !== 'tag name' && by !== 'css selector') { throw new Error('Unsupported locator strategy: ' + by); }
+    return Array.prototype.slice.call(root.querySelectorAll(value));
+};
+var readValue = function (element, attribute) {
+    if (!element) { return null; }
+    if (attribute === 'text') { return (element.innerText || element.textContent || '').trim(); }
+    return element.getAttribute(attribute);
+};
+"""
+
+# arguments: row locator, {field: [locator, attribute]} read per row, {field: [locator, attribute]} read once
+ROWS_SNAPSHOT = FIND_ALL + """
+var rows = findAll(document, arguments[0]), fields = arguments[1], extras = arguments[2] || {};
+var snapshot = {rows: []};
+rows.forEach(function (row) {
+    var item = {};
+    Object.keys(fields).forEach(function (key) {
+        item[key] = readValue(findAll(row, fields[key][0])[0], fields[key][1]);
+    });
+    snapshot.rows.push(item);
+});
+Object.keys(extras).forEach(function (key) {
+    snapshot[key] = readValue(findAll(document, extras[key][0])[0], extras[key][1]);
+});
+return snapshot;
+"""
+
+# arguments: [[locator, value], ...]. Sets each field through the native value setter and
+# fires the input/change events a user would trigger. Returns the locators it could not find.
+FILL_FORM = FIND_ALL + """
+var missing = [];
+arguments[0].forEach(function (entry) {
+    var element = findAll(document, entry[0])[0];
+    if (!element) { missing.push(entry[0]); return; }
+    var prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    var setter = Object.getOwnPropertyDescriptor(prototype, 'value').set;
+    element.focus();
+    setter.call(element, entry[1]);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    element.blur();
+});
+return missing;
+"""
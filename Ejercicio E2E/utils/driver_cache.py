@@ -0,0 +1,78 @@
+# On-disk cache of the browser startup strategy that worked on this machine
+import json
+import os
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+from utils import settings
+
+_BROWSER_TYPES = {
+    "chrome": ChromeType.GOOGLE,
+    "edge": ChromeType.MSEDGE,
+}
+
+def detect_browser_version(browser):
+    """Installed version of the browser, or None if it cannot be determined"""
+    try:
+        return OperationSystemManager().get_browser_version_from_os(_BROWSER_TYPES[browser])
+    except Exception:
+        return None
+
+class DriverResolutionCache:
+    """Remembers which startup strategy and driver binary worked, keyed on the browser version"""
+    
+    def __init__(self, path=None):
+        self.path = settings.DRIVER_CACHE_PATH if path is None else path
+    
+    @property
+    def enabled(self):
+        return bool(self.path)
+    
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+    
+    def lookup(self):
+        """Cached entry if the browser fingerprint and driver binary are still valid"""
+        if not self.enabled:
+            return None
+        entry = self._read()
+        if not entry:
+            return None
+        
+        driver_path = entry.get("driver_path")
+        if driver_path and not os.path.exists(driver_path):
+            return None
+        if entry.get("browser_version") != detect_browser_version(entry.get("browser")):
+            print("🔄 Browser version changed, ignoring cached driver strategy")
+            return None
+        return entry
+    
+    def store(self, strategy, browser, driver_path):
+        """Record the strategy that just worked"""
+        if not self.enabled:
+            return
+        entry = {
+            "strategy": strategy,
+            "browser": browser,
+            "browser_version": detect_browser_version(browser),
+            "driver_path": driver_path,
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Write then rename so parallel workers never read a half-written file
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(entry, cache_file, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not write driver cache: {e}")
+    
+    def invalidate(self):
+        """Drop the cached entry"""
+        if self.enabled and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
@@ -1,4 +1,5 @@
 # Simple WebDriver Manager for E2E Tests
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -7,70 +8,98 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, NoAlertPresentException,
+    NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
+)
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
-import time
+from contextlib import contextmanager
+from utils import settings
+from utils.driver_cache import DriverResolutionCache
+from utils.element_cache import ElementCache
+from utils.devtools_log import PerformanceLog
+from utils.dialogs import dialog_shown, install_dialog_hook, keep_unhandled_prompts
+from utils.dom_scripts import FILL_FORM, ROWS_SNAPSHOT, scriptable
+from utils.network_capture import NetworkCapture, capture_for
+from utils.network_profile import NetworkProfile
+from utils.page_metrics import page_metrics
+from utils.replay_proxy import ensure_proxy
+from utils.timing import tracer
+from utils.waits import install_instrumentation, page_settled
 
 class DriverManager:
     """Simple WebDriver manager with automatic driver downloads"""
     
+    # Startup strategies in fallback order: (key, browser, label, progress message)
+    STRATEGIES = (
+        ("chrome_wdm", "chrome", "Chrome (WebDriver Manager)", "Chrome with WebDriver Manager"),
+        ("chrome_path", "chrome", "Chrome (System PATH)", "Chrome from system PATH"),
+        ("edge_wdm", "edge", "Edge (WebDriver Manager)", "Edge with WebDriver Manager"),
+        ("edge_path", "edge", "Edge (System PATH)", "Edge from system PATH"),
+    )
+    
     def __init__(self):
         self.driver = None
         self.browser_type = None
+        self.tests_served = 0
+        self.resolution_cache = DriverResolutionCache()
+        self.network_profile = NetworkProfile()
+        self.network_capture = NetworkCapture()
+        self.devtools_log = PerformanceLog()
+        self._setup_thread = None
+        self._setup_error = None
+    
+    def setup_driver_in_background(self, headless=False):
+        """Start setup_driver in a daemon thread; wait_for_setup() returns the driver"""
+        def setup():
+            try:
+                self.setup_driver(headless=headless)
+            except Exception as e:
+                self._setup_error = e
+        self._setup_thread = threading.Thread(target=setup, name="browser-prewarm", daemon=True)
+        self._setup_thread.start()
+    
+    def wait_for_setup(self):
+        """Wait for a background setup to finish; raises its error if it failed"""
+        if self._setup_thread is not None:
+            self._setup_thread.join()
+            self._setup_thread = None
+        if self._setup_error is not None:
+            error, self._setup_error = self._setup_error, None
+            raise error
+        return self.driver
     
     def setup_driver(self, headless=False):
         """Setup WebDriver with automatic driver management"""
         print("🚀 Setting up browser...")
+        # Pages are opened through the record/replay proxy when one is configured
+        ensure_proxy()
         
-        # Strategy 1: Try Chrome with WebDriver Manager
-        try:
-            print("🔍 Trying Chrome with WebDriver Manager...")
-            chrome_options = self._get_chrome_options(headless)
-            service = ChromeService(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.browser_type = "Chrome (WebDriver Manager)"
-            self._configure_driver()
-            print("✅ Chrome configured successfully!")
-            return self.driver
-        except Exception as e:
-            print(f"❌ Chrome with WebDriver Manager failed: {str(e)}")
-        
-        # Strategy 2: Try Chrome without service (system PATH)
-        try:
-            print("🔍 Trying Chrome from system PATH...")
-            chrome_options = self._get_chrome_options(headless)
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.browser_type = "Chrome (System PATH)"
-            self._configure_driver()
-            print("✅ Chrome configured successfully!")
-            return self.driver
-        except Exception as e:
-            print(f"❌ Chrome from system PATH failed: {str(e)}")
-        
-        # Strategy 3: Try Edge with WebDriver Manager
-        try:
-            print("🔍 Trying Edge with WebDriver Manager...")
-            edge_options = self._get_edge_options(headless)
-            service = EdgeService(EdgeChromiumDriverManager().install())
-            self.driver = webdriver.Edge(service=service, options=edge_options)
-            self.browser_type = "Edge (WebDriver Manager)"
-            self._configure_driver()
-            print("✅ Edge configured successfully!")
-            return self.driver
-        except Exception as e:
-            print(f"❌ Edge with WebDriver Manager failed: {str(e)}")
-        
-        # Strategy 4: Try Edge without service (system PATH)
-        try:
-            print("🔍 Trying Edge from system PATH...")
-            edge_options = self._get_edge_options(headless)
-            self.driver = webdriver.Edge(options=edge_options)
-            self.browser_type = "Edge (System PATH)"
-            self._configure_driver()
-            print("✅ Edge configured successfully!")
-            return self.driver
-        except Exception as e:
-            print(f"❌ Edge from system PATH failed: {str(e)}")
+        # Fast path: go straight to the strategy that worked last time for this browser version
+        cached = self.resolution_cache.lookup()
+        if cached:
+            strategy = self._find_strategy(cached["strategy"])
+            if strategy:
+                try:
+                    print(f"⚡ Using cached strategy: {strategy[2]}")
+                    self._launch(strategy, headless, cached.get("driver_path"))
+                    print(f"✅ {strategy[2]} configured successfully!")
+                    return self.driver
+                except Exception as e:
+                    print(f"❌ Cached strategy failed: {str(e)}")
+                    self.resolution_cache.invalidate()
+        
+        for strategy in self.STRATEGIES:
+            key, browser, label, message = strategy
+            try:
+                print(f"🔍 Trying {message}...")
+                driver_path = self._launch(strategy, headless)
+                self.resolution_cache.store(key, browser, driver_path)
+                print(f"✅ {label.split(' ')[0]} configured successfully!")
+                return self.driver
+            except Exception as e:
+                print(f"❌ {message} failed: {str(e)}")
         
         # If all strategies fail, provide clear error
         raise Exception("""
@@ -85,8 +114,37 @@ SOLUTION STEPS:
 If still failing, the browser may be installed but not in system PATH.
         """)
     
-    def _get_chrome_options(self, headless=False):
-        """Get optimized Chrome options"""
+    def _find_strategy(self, key):
+        """Strategy tuple for a key, or None if unknown"""
+        for strategy in self.STRATEGIES:
+            if strategy[0] == key:
+                return strategy
+        return None
+    
+    def _launch(self, strategy, headless=False, driver_path=None):
+        """Start the browser with one strategy and return the driver binary it used"""
+        key, browser, label, _ = strategy
+        
+        if browser == "chrome":
+            if key == "chrome_wdm" and not driver_path:
+                driver_path = ChromeDriverManager().install()
+            service = ChromeService(driver_path) if driver_path else ChromeService()
+            self.driver = webdriver.Chrome(service=service, options=self.get_chrome_options(headless))
+        else:
+            if key == "edge_wdm" and not driver_path:
+                driver_path = EdgeChromiumDriverManager().install()
+            service = EdgeService(driver_path) if driver_path else EdgeService()
+            self.driver = webdriver.Edge(service=service, options=self.get_edge_options(headless))
+        
+        self.browser_type = label
+        self._configure_driver()
+        return self.driver.service.path
+    
+    def get_chrome_options(self, headless=False, performance_log=True):
+        """
+        Get optimized Chrome options. performance_log=False leaves out the DevTools log the
+        network profile and capture read, for sessions that never drain it.
+        """
         options = ChromeOptions()
         
         if headless:
@@ -106,10 +164,17 @@ If still failing, the browser may be installed but not in system PATH.
         options.add_experimental_option("excludeSwitches", ["enable-logging"])
         options.add_experimental_option('useAutomationExtension', False)
         
+        # Resource blocking and page-load strategy
+        self.network_profile.apply_to_options(options, performance_log)
+        if performance_log:
+            self.network_capture.apply_to_options(options)
+        if settings.INTERCEPT_ALERTS:
+            keep_unhandled_prompts(options)
+        
         return options
     
-    def _get_edge_options(self, headless=False):
-        """Get optimized Edge options"""
+    def get_edge_options(self, headless=False, performance_log=True):
+        """Get optimized Edge options (see get_chrome_options)"""
         options = EdgeOptions()
         
         if headless:
@@ -128,17 +193,74 @@ If still failing, the browser may be installed but not in system PATH.
         options.add_experimental_option("excludeSwitches", ["enable-logging"])
         options.add_experimental_option('useAutomationExtension', False)
         
+        # Resource blocking and page-load strategy
+        self.network_profile.apply_to_options(options, performance_log)
+        if performance_log:
+            self.network_capture.apply_to_options(options)
+        if settings.INTERCEPT_ALERTS:
+            keep_unhandled_prompts(options)
+        
         return options
     
     def _configure_driver(self):
         """Configure the driver after successful initialization"""
         if self.driver:
             self.driver.maximize_window()
-            self.driver.implicitly_wait(10)
+            self.driver.implicitly_wait(settings.IMPLICIT_WAIT)
+            install_instrumentation(self.driver)
+            if settings.INTERCEPT_ALERTS and not install_dialog_hook(self.driver):
+                print("⚠️ Could not install the alert hook, using native alerts")
+            self.network_profile.apply_to_driver(self.driver, self.devtools_log)
+            self.network_capture.apply_to_driver(self.driver, self.devtools_log)
+    
+    def reset_state(self):
+        """Reset cookies, storage, windows and alerts so the browser can serve another test"""
+        if not self.driver:
+            return False
+        try:
+            # Consume DevTools events of the previous test before the log grows
+            self.devtools_log.drain(self.driver)
+            self.network_capture.clear()
+            
+            # Dismiss any alert left open by the previous test
+            try:
+                self.driver.switch_to.alert.dismiss()
+            except NoAlertPresentException:
+                pass
+            
+            # Close stray windows and tabs, keep the first one
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            
+            # Storage can only be cleared from the origin that owns it
+            try:
+                self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except WebDriverException:
+                pass
+            
+            # Clear cookies for every domain (CDP), or only the current one as fallback
+            try:
+                self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except (AttributeError, WebDriverException):
+                self.driver.delete_all_cookies()
+            
+            self.driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            print(f"⚠️ Could not reset browser state: {e}")
+            return False
     
     def quit_driver(self):
         """Close the browser and quit the driver"""
         if self.driver:
+            try:
+                self.devtools_log.drain(self.driver)
+                self.network_profile.report()
+            except Exception as e:
+                print(f"⚠️ Could not report network profile: {e}")
             try:
                 self.driver.quit()
                 print(f"🔚 {self.browser_type} browser closed")
@@ -146,57 +268,220 @@ If still failing, the browser may be installed but not in system PATH.
                 print(f"⚠️ Error closing browser: {e}")
             finally:
                 self.driver = None
+                self.tests_served = 0
 
 class BasePage:
     """Base page with common WebDriver utilities"""
     
+    # Conditions that tell when this page is ready; page objects override them
+    READY_CONDITIONS = (page_settled(),)
+    
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = WebDriverWait(driver, settings.WAIT_TIMEOUT)
+        self.elements = ElementCache()
+    
+    @contextmanager
+    def implicit_wait_disabled(self):
+        """Turn off the implicit wait inside the block so lookups answer immediately"""
+        # Restore what was set before (nested blocks, pages with their own wait), not the default
+        previous = self.driver.timeouts.implicit_wait
+        if previous:
+            self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            if previous:
+                self.driver.implicitly_wait(previous)
+    
+    @tracer.primitive
+    def wait_until_ready(self, *conditions, timeout=None):
+        """Wait until every readiness condition holds, polling on real page signals"""
+        timeout = settings.WAIT_TIMEOUT if timeout is None else timeout
+        # Each poll must answer immediately, not stall on the implicit wait
+        with tracer.phase("wait"), self.implicit_wait_disabled():
+            WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(
+                lambda driver: all(condition(driver) for condition in conditions)
+            )
+    
+    @tracer.primitive
+    def probe(self, condition, expect_present=False, present_timeout=None, absent_timeout=None):
+        """Evaluate a condition, waiting long only when a "yes" is expected; returns its value or None"""
+        if expect_present:
+            timeout = settings.WAIT_TIMEOUT if present_timeout is None else present_timeout
+        else:
+            timeout = settings.PROBE_TIMEOUT if absent_timeout is None else absent_timeout
+        try:
+            with tracer.phase("wait"), self.implicit_wait_disabled():
+                return WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(condition)
+        except TimeoutException:
+            return None
+    
+    def wait_for_page_ready(self, timeout=None):
+        """Wait for the readiness conditions declared by the page object"""
+        # Called after every navigation or re-render, so cached elements are outdated
+        self.elements.clear()
+        self.wait_until_ready(*self.READY_CONDITIONS, timeout=timeout)
     
+    def _resolve(self, locator, condition=EC.presence_of_element_located):
+        """Cached element for the locator, or wait for it and cache it"""
+        element = self.elements.get(locator)
+        if element is None:
+            with tracer.phase("wait"):
+                element = self.wait.until(condition(locator))
+            self.elements.store(locator, element)
+        return element
+    
+    def _act(self, locator, action, condition=EC.presence_of_element_located, retry_on=()):
+        """Run an action on the cached element, resolving it again once if it went stale"""
+        element = self._resolve(locator, condition)
+        try:
+            with tracer.phase("command"):
+                return action(element)
+        except (StaleElementReferenceException, *retry_on):
+            self.elements.discard(locator)
+            element = self._resolve(locator, condition)
+            with tracer.phase("command"):
+                return action(element)
+    
+    @tracer.primitive
+    def open_url(self, url):
+        """Navigate the browser to a URL"""
+        self.elements.clear()
+        with tracer.phase("command"):
+            self.driver.get(url)
+    
+    @tracer.primitive
     def click_element(self, locator):
         """Click on an element with wait"""
-        element = self.wait.until(EC.element_to_be_clickable(locator))
-        element.click()
+        # A cached element may be covered or not yet interactable: fall back to the clickable wait
+        self._act(
+            locator, lambda element: element.click(), EC.element_to_be_clickable,
+            retry_on=(ElementClickInterceptedException, ElementNotInteractableException)
+        )
     
+    @tracer.primitive
     def send_keys_to_element(self, locator, text):
         """Send keys to an element with wait"""
-        element = self.wait.until(EC.presence_of_element_located(locator))
-        element.clear()
-        element.send_keys(text)
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+        self._act(locator, type_text)
+    
+    @tracer.primitive
+    def fill_form(self, values, human_typing=None):
+        """
+        Fill several fields from a {locator: value} mapping.
+        By default all fields are set in one script call that fires input/change events;
+        human_typing (or E2E_HUMAN_TYPING) types real keystrokes field by field instead.
+        """
+        if human_typing is None:
+            human_typing = settings.HUMAN_TYPING
+        
+        if human_typing or not scriptable(*values):
+            for locator, value in values.items():
+                self.send_keys_to_element(locator, value)
+            return
+        
+        with tracer.phase("command"):
+            missing = self.driver.execute_script(FILL_FORM, [[locator, value] for locator, value in values.items()])
+        if missing:
+            raise NoSuchElementException(f"Form fields not found: {missing}")
     
+    @tracer.primitive
     def wait_for_element(self, locator):
         """Wait for element to be present"""
-        return self.wait.until(EC.presence_of_element_located(locator))
+        with tracer.phase("wait"):
+            return self.elements.store(locator, self.wait.until(EC.presence_of_element_located(locator)))
     
+    @tracer.primitive
     def wait_for_element_clickable(self, locator):
         """Wait for element to be clickable"""
-        return self.wait.until(EC.element_to_be_clickable(locator))
+        with tracer.phase("wait"):
+            return self.elements.store(locator, self.wait.until(EC.element_to_be_clickable(locator)))
     
+    @tracer.primitive
     def get_text(self, locator):
         """Get text from element"""
-        element = self.wait.until(EC.presence_of_element_located(locator))
-        return element.text
+        return self._act(locator, lambda element: element.text)
     
-    def is_element_present(self, locator):
-        """Check if element is present"""
-        try:
-            self.wait.until(EC.presence_of_element_located(locator))
-            return True
-        except:
-            return False
+    @tracer.primitive
+    def extract_rows(self, row_locator, fields, extras=None):
+        """
+        Read a table-like structure in one script call.
+        fields maps a key to (locator relative to the row, "text" or attribute name);
+        extras are read once from the document. Returns {"rows": [...], **extras}.
+        """
+        extras = extras or {}
+        locators = [row_locator] + [locator for locator, _ in fields.values()] + [locator for locator, _ in extras.values()]
+        if not scriptable(*locators):
+            return self._extract_rows_with_driver(row_locator, fields, extras)
+        with tracer.phase("command"):
+            return self.driver.execute_script(ROWS_SNAPSHOT, row_locator, fields, extras)
+    
+    def _extract_rows_with_driver(self, row_locator, fields, extras):
+        """extract_rows through WebDriver lookups, for locators the script cannot resolve"""
+        def read(root, locator, attribute):
+            found = root.find_elements(*locator)
+            if not found:
+                return None
+            return found[0].text.strip() if attribute == "text" else found[0].get_attribute(attribute)
+        
+        with tracer.phase("command"), self.implicit_wait_disabled():
+            snapshot = {"rows": [
+                {key: read(row, locator, attribute) for key, (locator, attribute) in fields.items()}
+                for row in self.driver.find_elements(*row_locator)
+            ]}
+            for key, (locator, attribute) in extras.items():
+                snapshot[key] = read(self.driver, locator, attribute)
+        return snapshot
+    
+    def is_element_present(self, locator, expect_present=False):
+        """Check if element is present, answering "no" after a short probe"""
+        return self.probe(EC.presence_of_element_located(locator), expect_present) is not None
+    
+    def is_element_visible(self, locator, expect_present=False):
+        """Check if element is visible, answering "no" after a short probe"""
+        return self.probe(EC.visibility_of_element_located(locator), expect_present) is not None
     
+    @tracer.primitive
     def scroll_to_element(self, locator):
         """Scroll to element"""
-        element = self.wait.until(EC.presence_of_element_located(locator))
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(0.5)
+        # Instant scroll: the element is in view as soon as the script returns
+        self._act(locator, lambda element: self.driver.execute_script(
+            "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", element
+        ))
     
-    def accept_alert(self):
-        """Accept browser alert"""
-        try:
-            alert = self.wait.until(EC.alert_is_present())
-            alert.accept()
-            return True
-        except:
-            return False
\ No newline at end of file
+    @tracer.primitive
+    def record_page_metrics(self, page, in_page=False):
+        """Record navigation, paint and resource timings of the transition that just finished"""
+        with tracer.phase("command"):
+            return page_metrics.record(self.driver, page, in_page)
+    
+    @property
+    def network(self):
+        """Network capture of this browser, or None when it is off or unavailable"""
+        return capture_for(self.driver)
+    
+    @tracer.primitive
+    def wait_for_response(self, endpoint, since=0, match=None, timeout=None):
+        """Next captured response of a backend endpoint after the mark; None without network capture"""
+        if self.network is None:
+            return None
+        with tracer.phase("wait"):
+            return self.network.wait_for_response(endpoint, since=since, match=match, timeout=timeout)
+    
+    @tracer.primitive
+    def wait_for_dialog(self, contains=None, expect_dialog=True):
+        """Message of the next alert/confirm (from the hook's queue, or a native alert, accepted); None if none"""
+        dialog = self.probe(dialog_shown(contains, settings.INTERCEPT_ALERTS), expect_present=expect_dialog)
+        if dialog is None:
+            return None
+        if dialog["native"]:
+            with tracer.phase("command"):
+                self.driver.switch_to.alert.accept()
+        return dialog["message"]
+    
+    def accept_alert(self, expect_alert=True):
+        """Accept browser alert; only waits the full timeout when an alert is expected"""
+        return self.wait_for_dialog(expect_dialog=expect_alert) is not None
\ No newline at end of file
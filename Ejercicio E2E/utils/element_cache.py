@@ -0,0 +1,41 @@
+# Per-page cache of resolved WebElements, so repeated interactions on the same page
+# skip locator evaluation (mostly contains(text(), ...) XPath) until the element goes stale
+class ElementCache:
+    """Resolved elements keyed by locator, with hit/miss counters"""
+    
+    # Totals across every page object of the process, for the end-of-run summary
+    total_hits = 0
+    total_misses = 0
+    
+    def __init__(self):
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, locator):
+        """Cached element for the locator, or None (counted as a miss)"""
+        element = self._elements.get(locator)
+        if element is None:
+            self.misses += 1
+            ElementCache.total_misses += 1
+        else:
+            self.hits += 1
+            ElementCache.total_hits += 1
+        return element
+    
+    def store(self, locator, element):
+        self._elements[locator] = element
+        return element
+    
+    def discard(self, locator):
+        """Forget one element, e.g. after it went stale"""
+        self._elements.pop(locator, None)
+    
+    def clear(self):
+        """Forget every element, e.g. after a navigation or re-render"""
+        self._elements.clear()
+    
+    @classmethod
+    def hit_rate(cls):
+        lookups = cls.total_hits + cls.total_misses
+        return cls.total_hits / lookups if lookups else 0.0
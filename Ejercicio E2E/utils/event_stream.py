@@ -0,0 +1,178 @@
+# Structured run events: a pytest plugin appends one JSON line per test and per step to
+# a file, and EventMonitor follows those files live to print progress, ETA and throughput.
+# The same files are the run's result store: utils.html_report renders them on demand.
+import json
+import os
+import shutil
+import threading
+import time
+from utils import settings
+from utils.timing import tracer
+
+class EventStreamPlugin:
+    """
+    Writes collection, test, step and session events as JSON lines, flushed immediately.
+    Each test_end carries the outcome, the failure text, the test's step timings and the
+    path of its captured output, which goes to a separate log file instead of the store.
+    """
+    
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        self.logs_dir = os.path.splitext(path)[0] + "-logs"
+        shutil.rmtree(self.logs_dir, ignore_errors=True)
+        self._lock = threading.Lock()
+        self._current = None
+        self._phases = []
+        self._first_step = 0
+        self._tests = 0
+        tracer.step_listeners.append(self._on_step)
+    
+    def emit(self, event, **data):
+        data.update(event=event, ts=time.time())
+        line = json.dumps(data, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+    
+    def _on_step(self, test, step):
+        if self._current:
+            self.emit("step", nodeid=self._current, step=step)
+    
+    def pytest_collection_finish(self, session):
+        self.emit("collection", count=len(session.items), worker=settings.WORKER_ID)
+    
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._current = nodeid
+        self._phases = []
+        self._first_step = tracer.steps_closed
+        self.emit("test_start", nodeid=nodeid)
+    
+    def pytest_runtest_logreport(self, report):
+        # One test_end per test, after teardown, when every phase and step is known
+        self._phases.append(report)
+        if report.when == "teardown":
+            self._emit_test_end(report)
+    
+    def _emit_test_end(self, last_report):
+        phases = {report.when: report for report in self._phases}
+        setup, call = phases.get("setup"), phases.get("call")
+        if setup is not None and setup.failed:
+            outcome = "error"
+        elif call is not None:
+            outcome = call.outcome
+        else:
+            outcome = setup.outcome if setup is not None else "error"
+        if last_report.failed and outcome == "passed":
+            outcome = "error"
+        
+        failure = next((report for report in self._phases if report.failed), None)
+        self._tests += 1
+        self.emit(
+            "test_end", nodeid=last_report.nodeid, outcome=outcome,
+            duration=round(sum(report.duration for report in self._phases), 3),
+            worker=settings.WORKER_ID,
+            longrepr=str(failure.longrepr) if failure is not None else None,
+            log=self._write_log(last_report),
+            steps=tracer.summary(tracer.steps_since(self._first_step)),
+        )
+    
+    def _write_log(self, report):
+        """Captured output of every phase, written to its own file; returns the path or None"""
+        sections = [(title, text) for title, text in report.sections if text]
+        if not sections:
+            return None
+        os.makedirs(self.logs_dir, exist_ok=True)
+        path = os.path.join(self.logs_dir, f"{self._tests:05d}.log")
+        with open(path, "w", encoding="utf-8") as log_file:
+            for title, text in sections:
+                log_file.write(f"----- {title} -----\n{text}\n")
+        return path
+    
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self._current = None
+    
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.emit("session_end", exitstatus=int(exitstatus))
+        self._file.close()
+        tracer.step_listeners.remove(self._on_step)
+
+class EventMonitor:
+    """Follows one or more event files and prints live progress; keeps only counters in memory"""
+    
+    ICONS = {"passed": "✅", "failed": "❌", "error": "💥", "skipped": "⏭️"}
+    
+    def __init__(self, paths, show_steps=True, poll_interval=0.2):
+        self.paths = list(paths)
+        self.show_steps = show_steps
+        self.poll_interval = poll_interval
+        self.total = 0
+        self.done = 0
+        self.outcomes = {}
+        self._start = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        self._start = time.time()
+        self._thread = threading.Thread(target=self._follow, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Read whatever is left in the files and stop following them"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+    
+    def _follow(self):
+        handles = {}
+        while True:
+            stopping = self._stop.is_set()
+            for path in self.paths:
+                if path not in handles:
+                    if not os.path.exists(path):
+                        continue
+                    handles[path] = open(path, encoding="utf-8")
+                handle = handles[path]
+                while True:
+                    position = handle.tell()
+                    line = handle.readline()
+                    if not line.endswith("\n"):
+                        # Partial line: wait for the writer to finish it
+                        handle.seek(position)
+                        break
+                    self._handle(json.loads(line))
+            if stopping:
+                break
+            time.sleep(self.poll_interval)
+        for handle in handles.values():
+            handle.close()
+    
+    def _handle(self, event):
+        kind = event["event"]
+        if kind == "collection":
+            self.total += event["count"]
+        elif kind == "step" and self.show_steps:
+            print(f"      ↳ {event['step']}", flush=True)
+        elif kind == "test_start":
+            print(f"   ▶️ {event['nodeid']}", flush=True)
+        elif kind == "test_end":
+            self.done += 1
+            self.outcomes[event["outcome"]] = self.outcomes.get(event["outcome"], 0) + 1
+            icon = self.ICONS.get(event["outcome"], "•")
+            print(f"   {icon} [{self.done}/{self.total or '?'}] {event['nodeid']} "
+                  f"({event['duration']:.1f}s) | {self.progress()}", flush=True)
+    
+    def progress(self):
+        """Throughput and ETA based on the tests finished so far"""
+        elapsed = time.time() - self._start
+        if not self.done or not elapsed:
+            return "calculando..."
+        per_minute = self.done / elapsed * 60
+        remaining = max(self.total - self.done, 0)
+        eta = remaining * elapsed / self.done
+        return f"{per_minute:.1f} tests/min | ETA {int(eta // 60)}m{int(eta % 60):02d}s"
+    
+    def summary(self):
+        counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.outcomes.items()))
+        return f"{self.done} tests in {time.time() - self._start:.1f}s ({counts or 'no results'})"
@@ -0,0 +1,138 @@
+# On-demand HTML view of the JSONL result store written by utils.event_stream. Worker
+# stores merge by simply reading several files; captured logs stay in their own files
+# and are linked, not inlined, so the page stays small however long the run.
+# Usage (from "Ejercicio E2E"):
+#   python -m utils.html_report                                   # reports/events.jsonl
+#   python -m utils.html_report reports/workers/*.events.jsonl -o reports/parallel_report.html
+import argparse
+import glob
+import html
+import json
+import os
+
+DEFAULT_STORE = os.path.join("reports", "events.jsonl")
+DEFAULT_OUTPUT = os.path.join("reports", "report.html")
+
+# Rows per page of the results table
+PAGE_SIZE = 50
+
+def read_results(paths):
+    """test_end events of every store, streamed in file order"""
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as store:
+                for line in store:
+                    if '"test_end"' not in line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # A worker may still be writing its last line
+                        continue
+                    if event.get("event") == "test_end":
+                        yield event
+        except OSError:
+            continue
+
+_STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #212529; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #dee2e6; padding: 4px 8px; text-align: left; vertical-align: top; }
+.passed { color: #198754; } .failed, .error { color: #dc3545; } .skipped { color: #6c757d; }
+pre { white-space: pre-wrap; background: #f8f9fa; padding: 8px; max-height: 30em; overflow: auto; }
+.pager button { margin: 0 2px; }
+"""
+
+# Shows one page of rows at a time; everything is in the page, nothing is fetched
+_PAGER = """
+var rows = document.querySelectorAll('#results > tbody > tr.result'), size = %d, pager = document.getElementById('pager');
+function show(page) {
+    rows.forEach(function (row, i) { row.style.display = Math.floor(i / size) === page ? '' : 'none'; });
+}
+for (var p = 0; p * size < rows.length; p++) {
+    var button = document.createElement('button');
+    button.textContent = p + 1;
+    button.onclick = (function (page) { return function () { show(page); }; })(p);
+    pager.appendChild(button);
+}
+show(0);
+"""
+
+def _steps_table(steps):
+    if not steps:
+        return ""
+    rows = "".join(
+        f"<tr><td>{html.escape(row['step'])}</td><td>{row['calls']}</td><td>{row['wait']}</td>"
+        f"<td>{row['command']}</td><td>{row['total']}</td></tr>"
+        for row in steps
+    )
+    return (
+        "<details><summary>Step timings (ms)</summary><table>"
+        "<tr><th>Step</th><th>Calls</th><th>Wait</th><th>Command</th><th>Total</th></tr>"
+        + rows + "</table></details>"
+    )
+
+def _result_row(event, output_dir):
+    outcome = event["outcome"]
+    log = event.get("log")
+    log_link = f'<a href="{html.escape(os.path.relpath(log, output_dir))}">log</a>' if log else ""
+    details = _steps_table(event.get("steps"))
+    if event.get("longrepr"):
+        details += f"<details open><summary>Failure</summary><pre>{html.escape(event['longrepr'])}</pre></details>"
+    return (
+        f'<tr class="result"><td class="{outcome}">{outcome}</td><td>{html.escape(event["nodeid"])}{details}</td>'
+        f'<td>{event["duration"]:.2f}s</td><td>{html.escape(str(event.get("worker") or "-"))}</td><td>{log_link}</td></tr>'
+    )
+
+def render(paths, output=DEFAULT_OUTPUT):
+    """Write the HTML report for the given stores and return the totals by outcome"""
+    output_dir = os.path.dirname(os.path.abspath(output))
+    os.makedirs(output_dir, exist_ok=True)
+    totals, duration, slowest = {}, 0.0, []
+    
+    # Rows are written as they are read; only totals and the slowest steps stay in memory
+    body_path = f"{output}.rows.tmp"
+    with open(body_path, "w", encoding="utf-8") as body:
+        for event in read_results(paths):
+            totals[event["outcome"]] = totals.get(event["outcome"], 0) + 1
+            duration += event["duration"]
+            for row in event.get("steps") or []:
+                slowest.append((row["total"], event["nodeid"], row["step"]))
+            slowest = sorted(slowest, reverse=True)[:10]
+            body.write(_result_row(event, output_dir) + "\n")
+    
+    summary = ", ".join(f'<span class="{outcome}">{count} {outcome}</span>' for outcome, count in sorted(totals.items()))
+    slowest_rows = "".join(
+        f"<tr><td>{total}</td><td>{html.escape(nodeid)}</td><td>{html.escape(step)}</td></tr>"
+        for total, nodeid, step in slowest
+    )
+    with open(output, "w", encoding="utf-8") as report, open(body_path, encoding="utf-8") as body:
+        report.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>E2E Report</title>"
+                     f"<style>{_STYLE}</style></head><body><h1>E2E Report</h1>")
+        report.write(f"<p>{sum(totals.values())} tests ({summary or 'no results'}) - "
+                     f"{duration:.1f}s of test time</p>")
+        if slowest_rows:
+            report.write("<h2>Slowest steps (ms)</h2><table><tr><th>Total</th><th>Test</th><th>Step</th></tr>"
+                         + slowest_rows + "</table>")
+        report.write('<h2>Results</h2><div class="pager" id="pager"></div><table id="results"><thead><tr>'
+                     "<th>Outcome</th><th>Test</th><th>Duration</th><th>Worker</th><th>Output</th></tr></thead><tbody>\n")
+        for line in body:
+            report.write(line)
+        report.write(f"</tbody></table><script>{_PAGER % PAGE_SIZE}</script></body></html>")
+    os.remove(body_path)
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the E2E result store as HTML")
+    parser.add_argument("stores", nargs="*", help=f"JSONL stores (default: {DEFAULT_STORE})")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+    
+    paths = []
+    for pattern in args.stores or [DEFAULT_STORE]:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    totals = render(paths, args.output)
+    print(f"📊 Report: {args.output} ({sum(totals.values())} tests)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+# Load mode: many purchase flows, read from a CSV/JSONL stream, driven through the page
+# objects across concurrent browser sessions; reports throughput, per-step latency and errors
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from local_store.server import LocalStore
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from utils import settings
+from utils.browser_pool import BrowserPool
+from utils.stats import summarize
+from utils.timing import tracer
+
+LOAD_REPORT = os.path.join("reports", "load_report.json")
+
+# Flow steps in order, as reported
+STEPS = ("home", "add_products", "cart", "checkout_form", "purchase", "confirmation")
+
+# Columns/keys of a flow row besides "products" (";"-separated in CSV, a list in JSONL)
+CUSTOMER_FIELDS = ("name", "country", "city", "card", "month", "year")
+
+def read_flows(path):
+    """Yield one flow (customer data + product names) per row of a CSV or JSONL file"""
+    with open(path, encoding="utf-8", newline="") as data_file:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in data_file if line.strip())
+        else:
+            rows = csv.DictReader(data_file)
+        for row in rows:
+            products = row["products"]
+            if isinstance(products, str):
+                products = [name.strip() for name in products.split(";") if name.strip()]
+            yield {"customer": {key: str(row[key]) for key in CUSTOMER_FIELDS}, "products": products}
+
+class LoadStats:
+    """Step latencies and outcomes of every flow, shared by the worker threads"""
+    
+    def __init__(self):
+        self.step_times = {step: [] for step in STEPS}
+        self.completed = 0
+        self.failed = 0
+        self.errors = {}
+        self._lock = threading.Lock()
+    
+    def record(self, timings, error=None):
+        with self._lock:
+            for step, seconds in timings.items():
+                self.step_times[step].append(seconds * 1000)
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+                kind = type(error).__name__
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+    
+    @property
+    def flows(self):
+        return self.completed + self.failed
+    
+    def report(self, elapsed):
+        return {
+            "flows": self.flows,
+            "completed": self.completed,
+            "failed": self.failed,
+            "error_rate": self.failed / self.flows if self.flows else 0.0,
+            "flows_per_minute": self.completed / elapsed * 60 if elapsed else 0.0,
+            "elapsed_s": elapsed,
+            "errors": self.errors,
+            "steps_ms": {step: summarize(times) for step, times in self.step_times.items()},
+        }
+
+def run_flow(driver, flow, timings):
+    """One purchase flow through the page objects, timing each step into timings"""
+    home_page = HomePage(driver)
+    product_page = ProductPage(driver)
+    cart_page = CartPage(driver)
+    checkout_page = CheckoutPage(driver)
+    
+    @contextlib.contextmanager
+    def timed(step):
+        start = time.perf_counter()
+        yield
+        timings[step] = time.perf_counter() - start
+    
+    with timed("home"):
+        home_page.navigate_to_home()
+    with timed("add_products"):
+        for product_name in flow["products"]:
+            home_page.select_product(product_name)
+            product_page.add_to_cart()
+    with timed("cart"):
+        cart_page.open_cart()
+        count = cart_page.get_cart_items_count()
+        assert count == len(flow["products"]), f"Expected {len(flow['products'])} items in cart, but found {count}"
+        cart_page.proceed_to_checkout()
+    with timed("checkout_form"):
+        checkout_page.fill_purchase_form(flow["customer"])
+    with timed("purchase"):
+        checkout_page.complete_purchase()
+    with timed("confirmation"):
+        assert checkout_page.is_purchase_successful(), "Purchase was not successful"
+    checkout_page.close_success_modal()
+
+async def run_flow_async(driver, flow, timings):
+    """run_flow on the async page objects"""
+    from pages.async_pages import AsyncCartPage, AsyncCheckoutPage, AsyncHomePage, AsyncProductPage
+    home_page = AsyncHomePage(driver)
+    product_page = AsyncProductPage(driver)
+    cart_page = AsyncCartPage(driver)
+    checkout_page = AsyncCheckoutPage(driver)
+    
+    start = time.perf_counter()
+    def lap(step):
+        nonlocal start
+        now = time.perf_counter()
+        timings[step] = now - start
+        start = now
+    
+    await home_page.navigate_to_home()
+    lap("home")
+    for product_name in flow["products"]:
+        await home_page.select_product(product_name)
+        await product_page.add_to_cart()
+    lap("add_products")
+    await cart_page.open_cart()
+    count = await cart_page.get_cart_items_count()
+    assert count == len(flow["products"]), f"Expected {len(flow['products'])} items in cart, but found {count}"
+    await cart_page.proceed_to_checkout()
+    lap("cart")
+    await checkout_page.fill_purchase_form(flow["customer"])
+    lap("checkout_form")
+    await checkout_page.complete_purchase()
+    lap("purchase")
+    assert await checkout_page.is_purchase_successful(), "Purchase was not successful"
+    lap("confirmation")
+    await checkout_page.close_success_modal()
+
+def _worker(pool, flows, flows_lock, stats, limit, progress):
+    """Take flows from the shared stream until it runs out, reusing one pooled browser"""
+    while True:
+        with flows_lock:
+            if limit is not None and stats.flows + progress["running"] >= limit:
+                return
+            flow = next(flows, None)
+            if flow is None:
+                return
+            progress["running"] += 1
+        
+        manager, timings, error = None, {}, None
+        try:
+            manager = pool.acquire()
+            run_flow(manager.driver, flow, timings)
+        except Exception as exc:
+            error = exc
+        if manager is not None:
+            pool.release(manager, failed=error is not None)
+        
+        # Recorded in the same step as the decrement so a worker never sees the flow uncounted
+        with flows_lock:
+            progress["running"] -= 1
+            stats.record(timings, error)
+        status = "✅" if error is None else f"❌ {type(error).__name__}"
+        print(f"   {status} flow #{stats.flows} ({flow['customer']['name']}, {len(flow['products'])} products)",
+              file=sys.__stdout__, flush=True)
+
+def run_load(path, sessions=4, limit=None, verbose=False):
+    """Run the purchase flows in path across concurrent sessions; returns the report"""
+    store = None
+    if settings.LOCAL_STORE:
+        store = LocalStore(latency_ms=settings.LOCAL_STORE_LATENCY_MS)
+        settings.BASE_URL = store.start()
+        settings.API_URL = store.api_url
+        print(f"🏪 Using local store at {settings.BASE_URL}")
+    
+    # Per-primitive tracing is per test and would grow without bound under load
+    tracer.enabled = False
+    pool = BrowserPool(headless=settings.HEADLESS)
+    stats = LoadStats()
+    flows = read_flows(path)
+    flows_lock = threading.Lock()
+    progress = {"running": 0}
+    
+    print(f"🏋️ Load run: {path} on {sessions} concurrent sessions")
+    start = time.time()
+    # Page objects log every action; under load only the per-flow lines are shown
+    with open(os.devnull, "w") as devnull, (contextlib.nullcontext() if verbose else contextlib.redirect_stdout(devnull)):
+        threads = [
+            threading.Thread(target=_worker, args=(pool, flows, flows_lock, stats, limit, progress))
+            for _ in range(sessions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.close_all()
+    elapsed = time.time() - start
+    if store:
+        store.stop()
+    
+    report = stats.report(elapsed)
+    print_report(report)
+    os.makedirs(os.path.dirname(LOAD_REPORT), exist_ok=True)
+    with open(LOAD_REPORT, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"📊 Load report: {LOAD_REPORT}")
+    return report
+
+async def _async_session(service, flows, stats, limit, progress):
+    """One browser session on the shared event loop, taking flows until the stream runs out"""
+    driver = None
+    while True:
+        if limit is not None and stats.flows + progress["running"] >= limit:
+            break
+        flow = next(flows, None)
+        if flow is None:
+            break
+        progress["running"] += 1
+        timings, error = {}, None
+        try:
+            if driver is None:
+                driver = await service.new_session()
+            await run_flow_async(driver, flow, timings)
+            await driver.delete_all_cookies()
+        except Exception as exc:
+            error = exc
+            # Like BrowserPool: a failed flow gets a fresh browser
+            if driver is not None:
+                await driver.quit()
+                driver = None
+        progress["running"] -= 1
+        stats.record(timings, error)
+        status = "✅" if error is None else f"❌ {type(error).__name__}"
+        print(f"   {status} flow #{stats.flows} ({flow['customer']['name']}, {len(flow['products'])} products)",
+              file=sys.__stdout__, flush=True)
+    if driver is not None:
+        await driver.quit()
+
+async def _run_async_sessions(flows, sessions, stats, limit):
+    from utils.async_driver import AsyncDriverService
+    service = AsyncDriverService(headless=settings.HEADLESS)
+    await service.start()
+    progress = {"running": 0}
+    try:
+        await asyncio.gather(*(
+            _async_session(service, flows, stats, limit, progress) for _ in range(sessions)
+        ))
+    finally:
+        await service.stop()
+
+def run_load_async(path, sessions=20, limit=None):
+    """run_load with every session multiplexed on one event loop and one chromedriver"""
+    store = None
+    if settings.LOCAL_STORE:
+        store = LocalStore(latency_ms=settings.LOCAL_STORE_LATENCY_MS)
+        settings.BASE_URL = store.start()
+        settings.API_URL = store.api_url
+        print(f"🏪 Using local store at {settings.BASE_URL}")
+    
+    stats = LoadStats()
+    print(f"🏋️ Async load run: {path} on {sessions} concurrent sessions (one process)")
+    start = time.time()
+    try:
+        asyncio.run(_run_async_sessions(read_flows(path), sessions, stats, limit))
+    except Exception as e:
+        print(f"❌ Async driver service failed: {str(e)}")
+    elapsed = time.time() - start
+    if store:
+        store.stop()
+    
+    report = stats.report(elapsed)
+    print_report(report)
+    os.makedirs(os.path.dirname(LOAD_REPORT), exist_ok=True)
+    with open(LOAD_REPORT, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"📊 Load report: {LOAD_REPORT}")
+    return report
+
+def print_report(report):
+    print(f"\n📊 LOAD RESULTS: {report['completed']}/{report['flows']} flows completed "
+          f"in {report['elapsed_s']:.1f}s")
+    print(f"   • Throughput: {report['flows_per_minute']:.1f} flows/min")
+    print(f"   • Error rate: {report['error_rate']:.1%} {report['errors'] or ''}")
+    print(f"   {'step':<16}{'n':>5}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}   (ms)")
+    for step, stats in report["steps_ms"].items():
+        if stats["count"]:
+            print(f"   {step:<16}{stats['count']:>5}{stats['p50']:>10.0f}{stats['p90']:>10.0f}"
+                  f"{stats['p95']:>10.0f}{stats['p99']:>10.0f}")
@@ -0,0 +1,130 @@
+# Capture of backend responses from the DevTools performance log: responses of the listed
+# API endpoints (viewcart, view, deletecart...) are fetched with Network.getResponseBody,
+# parsed as JSON and kept in a bounded buffer that page objects read and wait on
+import itertools
+import json
+import time
+import weakref
+from collections import deque
+from urllib.parse import urlparse
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from utils import settings
+from utils.devtools_log import enable_performance_log
+
+# Capture of each live driver, so page objects (which only hold the driver) can find it
+_captures = weakref.WeakKeyDictionary()
+
+def capture_for(driver):
+    """NetworkCapture attached to the driver, or None when capture is off or unavailable"""
+    try:
+        return _captures.get(driver)
+    except TypeError:
+        return None
+
+def endpoint_of(url):
+    """Last path segment of a URL ("https://api.demoblaze.com/viewcart" -> "viewcart")"""
+    return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+def _parse(text):
+    try:
+        return json.loads(text) if text else None
+    except ValueError:
+        return text
+
+class NetworkCapture:
+    """Records the responses of selected endpoints as {seq, endpoint, url, method, status, request, body}"""
+    
+    def __init__(self, endpoints=None, max_responses=None):
+        self.endpoints = set(settings.CAPTURE_ENDPOINTS if endpoints is None else endpoints)
+        self.responses = deque(maxlen=settings.CAPTURE_BUFFER if max_responses is None else max_responses)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._pending = {}
+        self._driver = None
+        self._devtools_log = None
+    
+    @property
+    def active(self):
+        return bool(self.endpoints)
+    
+    def apply_to_options(self, options):
+        """Browser options part of the capture (set before launch)"""
+        if self.active:
+            enable_performance_log(options)
+    
+    def apply_to_driver(self, driver, devtools_log):
+        """Start capturing on the live browser"""
+        if not self.active:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+        except (AttributeError, WebDriverException) as e:
+            print(f"⚠️ Could not enable network capture: {e}")
+            return
+        self._driver = driver
+        if self._devtools_log is not devtools_log:
+            self._devtools_log = devtools_log
+            devtools_log.subscribe(
+                ("Network.requestWillBeSent", "Network.responseReceived", "Network.loadingFinished", "Network.loadingFailed"),
+                self._on_event
+            )
+        _captures[driver] = self
+    
+    def _on_event(self, method, params):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            request = params.get("request", {})
+            endpoint = endpoint_of(request.get("url", ""))
+            if endpoint in self.endpoints and request.get("method") != "OPTIONS":
+                self._pending[request_id] = {
+                    "endpoint": endpoint, "url": request.get("url"), "method": request.get("method"),
+                    "request": _parse(request.get("postData")), "status": None,
+                }
+        elif request_id not in self._pending:
+            return
+        elif method == "Network.responseReceived":
+            self._pending[request_id]["status"] = params.get("response", {}).get("status")
+        elif method == "Network.loadingFinished":
+            self._record(request_id, self._pending.pop(request_id))
+        else:
+            self._pending.pop(request_id, None)
+    
+    def _record(self, request_id, entry):
+        try:
+            result = self._driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            entry["body"] = _parse(result.get("body"))
+        except WebDriverException:
+            # Evicted from the browser's buffer (e.g. after a navigation)
+            entry["body"] = None
+        entry["seq"] = self._last_seq = next(self._seq)
+        self.responses.append(entry)
+    
+    def mark(self):
+        """Position in the capture; pass it as since= to only see later responses"""
+        if self._devtools_log is not None:
+            self._devtools_log.drain(self._driver)
+        return self._last_seq
+    
+    def find(self, endpoint, since=0, match=None):
+        """Captured responses of the endpoint after the mark, oldest first"""
+        return [
+            entry for entry in self.responses
+            if entry["endpoint"] == endpoint and entry["seq"] > since and (match is None or match(entry))
+        ]
+    
+    def wait_for_response(self, endpoint, since=0, match=None, timeout=None):
+        """First response of the endpoint after the mark (and matching, if given); raises TimeoutException"""
+        timeout = settings.WAIT_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            self._devtools_log.drain(self._driver)
+            found = self.find(endpoint, since, match)
+            if found:
+                return found[0]
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"No '{endpoint}' response within {timeout}s")
+            time.sleep(0.05)
+    
+    def clear(self):
+        self.responses.clear()
+        self._pending.clear()
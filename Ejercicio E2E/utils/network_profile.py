@@ -0,0 +1,95 @@
+# Network profiles: which requests the browser skips and how long page loads block
+from selenium.common.exceptions import WebDriverException
+from utils import settings
+from utils.devtools_log import enable_performance_log
+
+# DevTools blocks by URL pattern, so resource types are mapped to their file extensions.
+# Icons stay allowed: favicon.ico is tiny and is a same-origin URL other code may load.
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.bmp"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav"],
+}
+
+# Third-party analytics and ad beacons; none of our assertions depend on them
+TRACKER_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+]
+
+PROFILES = {
+    # Everything loads and navigation waits for the full load event (previous behaviour)
+    "full": {"resource_types": (), "patterns": (), "page_load_strategy": "normal"},
+    # Skip images, fonts, media and trackers; navigation returns at DOMContentLoaded
+    "lean": {"resource_types": ("image", "font", "media"), "patterns": TRACKER_PATTERNS, "page_load_strategy": "eager"},
+}
+
+class NetworkProfile:
+    """Blocks URL patterns and resource types through DevTools and counts what was avoided"""
+    
+    def __init__(self, name=None, resource_types=None, patterns=None, page_load_strategy=None):
+        self.name = name or settings.NETWORK_PROFILE
+        preset = PROFILES.get(self.name, PROFILES["full"])
+        self.resource_types = tuple(preset["resource_types"] if resource_types is None else resource_types)
+        self.patterns = list(preset["patterns"] if patterns is None else patterns)
+        self.page_load_strategy = page_load_strategy or preset["page_load_strategy"]
+        self.blocked_requests = 0
+        self.blocked_urls = set()
+        self._requests = {}
+    
+    @property
+    def blocked_patterns(self):
+        patterns = list(self.patterns)
+        for resource_type in self.resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, ()))
+        return patterns
+    
+    @property
+    def active(self):
+        return bool(self.blocked_patterns)
+    
+    def apply_to_options(self, options, performance_log=True):
+        """Browser options part of the profile (set before launch); the log feeds report()"""
+        options.page_load_strategy = self.page_load_strategy
+        if self.active and performance_log:
+            enable_performance_log(options)
+    
+    def apply_to_driver(self, driver, devtools_log):
+        """DevTools part of the profile (set on the live browser)"""
+        if not self.active:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns})
+        except (AttributeError, WebDriverException) as e:
+            print(f"⚠️ Could not apply network profile '{self.name}': {e}")
+            return
+        devtools_log.subscribe(
+            ("Network.requestWillBeSent", "Network.loadingFinished", "Network.loadingFailed"), self._on_event
+        )
+    
+    def _on_event(self, method, params):
+        # Only requests in flight are tracked: each id is dropped when its load ends
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            self._requests[request_id] = params.get("request", {}).get("url")
+            return
+        url = self._requests.pop(request_id, None)
+        if method == "Network.loadingFailed" and params.get("blockedReason"):
+            self.blocked_requests += 1
+            if url:
+                self.blocked_urls.add(url)
+    
+    def report(self):
+        """
+        Print how many requests this browser did not have to load. Bytes avoided are not
+        reported: a blocked request never gets a response, so its size is unknown without
+        fetching it, which is what the profile avoids.
+        """
+        if not self.active:
+            return
+        print(f"🚫 Network profile '{self.name}': {self.blocked_requests} requests blocked "
+              f"({len(self.blocked_urls)} distinct URLs)")
@@ -0,0 +1,216 @@
+# Storefront performance collected as a side effect of the E2E flows: after each page
+# transition the page objects read Navigation Timing, paint and resource timing entries
+# with one script call and append them to a JSONL file that grows across runs. Each record
+# is tagged with the target it measured (the live store, the local store or the replay
+# proxy) and the network profile; percentiles and budgets only mix records of one of each.
+# Usage (from "Ejercicio E2E"):
+#   python -m utils.page_metrics                                  # per-page percentiles (live)
+#   python -m utils.page_metrics --budget cart.p95=2500 --budget home.fcp_ms.p95=1500
+#   python -m utils.page_metrics --target local --profile full
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from selenium.common.exceptions import WebDriverException
+from utils import settings
+from utils.stats import summarize
+
+# Metrics of the current document since the previous report. A new document reports its
+# navigation and paint timings once; later (in-page) transitions report only the resources
+# fetched since, e.g. the XHR calls that re-render the product grid for a category. An
+# in-page transition (arguments[0]) on a document never reported before only starts the
+# count, since there is no telling which of its resources belong to the transition.
+METRICS_SCRIPT = """
+var since = window.__e2eMetricsSince, navigation = null, paint = {};
+if (arguments[0] && since === undefined) {
+    window.__e2eMetricsSince = performance.now();
+    return null;
+}
+if (since === undefined) {
+    since = 0;
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (nav) {
+        navigation = {
+            ttfb_ms: nav.responseStart - nav.requestStart,
+            dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+            load_ms: nav.loadEventEnd || null,
+            document_bytes: nav.transferSize || 0
+        };
+    }
+    performance.getEntriesByType('paint').forEach(function (entry) {
+        paint[entry.name === 'first-contentful-paint' ? 'fcp_ms' : 'first_paint_ms'] = entry.startTime;
+    });
+}
+var resources = performance.getEntriesByType('resource').filter(function (entry) { return entry.startTime >= since; });
+var start = navigation ? 0 : (resources.length ? Math.min.apply(null, resources.map(function (e) { return e.startTime; })) : 0);
+var end = navigation ? navigation.dom_content_loaded_ms : start;
+var api = 0, bytes = 0;
+resources.forEach(function (entry) {
+    end = Math.max(end, entry.responseEnd);
+    bytes += entry.transferSize || 0;
+    if (entry.initiatorType === 'xmlhttprequest' || entry.initiatorType === 'fetch') { api++; }
+});
+window.__e2eMetricsSince = performance.now();
+return {navigation: navigation, paint: paint, resources: resources.length, api_calls: api,
+        resource_bytes: bytes, page_ms: end - start, url: location.href};
+"""
+
+# Metrics aggregated per page type; page_ms is the budgeted one unless a budget names another
+METRICS = ("page_ms", "ttfb_ms", "dom_content_loaded_ms", "fcp_ms", "resources", "api_calls", "resource_bytes")
+
+# Statistics a budget can name (see utils.stats.summarize)
+BUDGET_STATS = ("mean", "min", "max", "p50", "p90", "p95", "p99")
+
+def current_target():
+    """What this process measures: "live", "local" (local store) or "proxy-<mode>" (replay proxy)"""
+    if settings.LOCAL_STORE:
+        return "local"
+    proxy_mode = settings.PROXY_MODE or settings.PROXY_SHARED
+    return f"proxy-{proxy_mode}" if proxy_mode else "live"
+
+class PageMetrics:
+    """
+    Appends one record per page transition to the metrics file; this process's latest
+    records stay in records for the session summary and budgets
+    """
+    
+    def __init__(self, path=None, max_records=None):
+        self.path = settings.PAGE_METRICS_FILE if path is None else path
+        self.records = deque(maxlen=settings.PAGE_METRICS_BUFFER if max_records is None else max_records)
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self):
+        return bool(self.path)
+    
+    def record(self, driver, page, in_page=False):
+        """Read the metrics of the transition that just finished; returns the record or None"""
+        if not self.enabled:
+            return None
+        try:
+            raw = driver.execute_script(METRICS_SCRIPT, in_page)
+        except WebDriverException:
+            return None
+        if not raw:
+            return None
+        record = {
+            "ts": round(time.time(), 3), "page": page, "url": raw["url"], "worker": settings.WORKER_ID,
+            "target": current_target(), "profile": settings.NETWORK_PROFILE,
+            "navigation": raw["navigation"] is not None,
+            **(raw["navigation"] or {}), **raw["paint"],
+            **{key: raw[key] for key in ("page_ms", "resources", "api_calls", "resource_bytes")},
+        }
+        record = {key: round(value, 1) if isinstance(value, float) else value for key, value in record.items()}
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as metrics_file:
+                metrics_file.write(json.dumps(record) + "\n")
+            self.records.append(record)
+        return record
+
+page_metrics = PageMetrics()
+
+def load_records(path=None, since=None):
+    """Records of the metrics file, optionally only those newer than a timestamp"""
+    records = []
+    try:
+        with open(path or settings.PAGE_METRICS_FILE, encoding="utf-8") as metrics_file:
+            for line in metrics_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or record["ts"] >= since:
+                    records.append(record)
+    except OSError:
+        pass
+    return records
+
+def select(records, target="live", profile=None):
+    """Records of one target and, if given, one network profile (untagged records are left out)"""
+    return [
+        record for record in records
+        if record.get("target") == target and (profile is None or record.get("profile") == profile)
+    ]
+
+def aggregate(records):
+    """{page: {metric: summary}} with count, mean and percentiles of every metric"""
+    pages = {}
+    for record in records:
+        values = pages.setdefault(record["page"], {})
+        for metric in METRICS:
+            if record.get(metric) is not None:
+                values.setdefault(metric, []).append(record[metric])
+    return {page: {metric: summarize(values) for metric, values in metrics.items()} for page, metrics in pages.items()}
+
+def parse_budgets(specs):
+    """"cart.p95=2500" or "home.fcp_ms.p95=1500" -> [(page, metric, stat, limit)]"""
+    budgets = []
+    for spec in specs:
+        target, _, limit = spec.partition("=")
+        parts = target.strip().split(".")
+        if len(parts) == 2:
+            parts.insert(1, "page_ms")
+        try:
+            limit = float(limit)
+        except ValueError:
+            limit = None
+        if len(parts) != 3 or limit is None or parts[1] not in METRICS or parts[2] not in BUDGET_STATS:
+            raise ValueError(f"Invalid page budget '{spec}' (use page.pNN=ms or page.metric.pNN=ms)")
+        budgets.append((parts[0], parts[1], parts[2], limit))
+    return budgets
+
+def check_budgets(summary, budgets):
+    """Budget violations as messages; pages without records are not checked"""
+    violations = []
+    for page, metric, stat, limit in budgets:
+        value = summary.get(page, {}).get(metric, {}).get(stat)
+        if value is not None and value > limit:
+            violations.append(f"{page} {metric} {stat} = {value:.0f} (budget {limit:.0f})")
+    return violations
+
+def format_summary(summary):
+    """Table lines: page, samples and p50/p95 of the main metrics"""
+    lines = [f"{'page':<10} {'n':>4} {'page p50':>9} {'page p95':>9} {'ttfb p95':>9} {'fcp p95':>9} {'api/page':>8}"]
+    for page, metrics in sorted(summary.items()):
+        def stat(metric, name):
+            value = metrics.get(metric, {}).get(name)
+            return f"{value:>9.0f}" if value is not None else f"{'-':>9}"
+        api = metrics.get("api_calls", {}).get("mean")
+        lines.append(
+            f"{page:<10} {metrics['page_ms']['count']:>4} {stat('page_ms', 'p50')} {stat('page_ms', 'p95')} "
+            f"{stat('ttfb_ms', 'p95')} {stat('fcp_ms', 'p95')} {api if api is not None else 0:>8.1f}"
+        )
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-page performance of the store across E2E runs")
+    parser.add_argument("path", nargs="?", default=settings.PAGE_METRICS_FILE)
+    parser.add_argument("--budget", action="append", default=list(settings.PAGE_BUDGETS),
+                        help="page.pNN=ms or page.metric.pNN=ms (repeatable)")
+    parser.add_argument("--last-hours", type=float, default=None, help="Only records of the last N hours")
+    parser.add_argument("--target", default="live", help="live, local or proxy-<mode> (default: live)")
+    parser.add_argument("--profile", default=settings.NETWORK_PROFILE, help="Network profile of the records")
+    args = parser.parse_args()
+    try:
+        budgets = parse_budgets(args.budget)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    since = time.time() - args.last_hours * 3600 if args.last_hours else None
+    summary = aggregate(select(load_records(args.path, since), args.target, args.profile))
+    if not summary:
+        print(f"❌ No page metrics for target '{args.target}' and profile '{args.profile}' in {args.path}")
+        sys.exit(1)
+    for line in format_summary(summary):
+        print(line)
+    violations = check_budgets(summary, budgets)
+    for violation in violations:
+        print(f"❌ Budget exceeded: {violation}")
+    sys.exit(1 if violations else 0)
+
+if __name__ == "__main__":
+    main()
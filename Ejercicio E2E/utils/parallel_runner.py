@@ -0,0 +1,160 @@
+# Parallel sharded test runner: one pytest process (and one browser pool) per worker
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from utils import settings
+from utils.event_stream import EventMonitor
+from utils.html_report import read_results, render
+from utils.replay_proxy import ensure_proxy, stop_proxy
+from utils.run_history import RunHistory
+
+WORKERS_DIR = os.path.join("reports", "workers")
+MERGED_REPORT = os.path.join("reports", "parallel_report.xml")
+HTML_REPORT = os.path.join("reports", "report.html")
+
+def available_memory_mb():
+    """Available physical memory in MB, or None if it cannot be determined"""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo") as meminfo:
+                for line in meminfo:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+        except (OSError, ValueError):
+            return None
+    elif sys.platform == "win32":
+        import ctypes
+        
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("sullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+        
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys // (1024 * 1024)
+    return None
+
+def default_worker_count():
+    """Workers bounded by CPU cores and by how many browsers fit in available RAM"""
+    workers = os.cpu_count() or 1
+    memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        # Each worker may hold its pre-warmed spares besides the browser it is using
+        browsers_per_worker = 1 + max(settings.WARM_BROWSERS, 0)
+        workers = min(workers, memory_mb // (settings.BROWSER_MEMORY_MB * browsers_per_worker))
+    return max(1, workers)
+
+def collect_tests(test_paths):
+    """Collect pytest node ids without running them"""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", *test_paths, "--collect-only", "-q"],
+        capture_output=True, text=True
+    )
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+def shard_tests(tests, workers, history=None):
+    """Shards balanced by expected duration from the run history, as (tests, expected seconds)"""
+    return (history or RunHistory()).shard(tests, workers)
+
+def merge_junit_reports(paths, output_path):
+    """Merge per-worker JUnit XML files into a single report and return the totals"""
+    merged = ET.Element("testsuites")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            merged.append(suite)
+    
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    ET.ElementTree(merged).write(output_path, encoding="utf-8", xml_declaration=True)
+    return totals
+
+def run_parallel(test_paths, workers=None, pytest_args=()):
+    """Run tests across worker processes and merge the results; returns an exit code"""
+    workers = workers or default_worker_count()
+    tests = collect_tests(test_paths)
+    if not tests:
+        print("❌ No tests collected")
+        return 5
+    
+    history = RunHistory()
+    shards = shard_tests(tests, workers, history)
+    os.makedirs(WORKERS_DIR, exist_ok=True)
+    print(f"⚡ Running {len(tests)} tests on {len(shards)} workers")
+    if history.tests:
+        expected = sum(load for _, load in shards)
+        print(f"   Expected: {expected:.0f}s of work, longest shard {max(load for _, load in shards):.0f}s "
+              f"(ideal {expected / len(shards):.0f}s)")
+    
+    # One proxy shared by every worker: workers get its URLs instead of starting their own
+    # (with the local store each worker proxies its own store instead)
+    shared_env = {}
+    if settings.PROXY_MODE == "record" and settings.LOCAL_STORE:
+        print("❌ Record mode with E2E_LOCAL_STORE needs a serial run: each worker would record its own archive over the same files")
+        return 2
+    if settings.PROXY_MODE and not settings.LOCAL_STORE:
+        ensure_proxy()
+        shared_env = {
+            "E2E_PROXY": "", "E2E_PROXY_SHARED": settings.PROXY_MODE,
+            "E2E_BASE_URL": settings.BASE_URL, "E2E_API_URL": settings.API_URL,
+        }
+    
+    start = time.time()
+    processes = []
+    events_paths = []
+    for worker_id, (shard, _) in enumerate(shards):
+        junit_path = os.path.join(WORKERS_DIR, f"worker-{worker_id}.xml")
+        log_path = os.path.join(WORKERS_DIR, f"worker-{worker_id}.log")
+        events_path = os.path.join(WORKERS_DIR, f"worker-{worker_id}.events.jsonl")
+        if os.path.exists(events_path):
+            os.remove(events_path)
+        events_paths.append(events_path)
+        env = dict(os.environ, E2E_WORKER_ID=str(worker_id), E2E_EVENTS_FILE=events_path, **shared_env)
+        log_file = open(log_path, "w", encoding="utf-8")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pytest", *shard, f"--junitxml={junit_path}", *pytest_args],
+            stdout=log_file, stderr=subprocess.STDOUT, env=env
+        )
+        processes.append((worker_id, process, log_file, junit_path, log_path))
+    
+    # Live progress across all workers while they run
+    monitor = EventMonitor(events_paths, show_steps=False)
+    monitor.start()
+    returncode = 0
+    for worker_id, process, log_file, junit_path, log_path in processes:
+        code = process.wait()
+        log_file.close()
+        status = "✅" if code == 0 else "❌"
+        print(f"   {status} Worker {worker_id} finished (exit {code}) - log: {log_path}")
+        returncode = returncode or code
+    monitor.stop()
+    stop_proxy()
+    
+    totals = merge_junit_reports([p[3] for p in processes], MERGED_REPORT)
+    elapsed = time.time() - start
+    print(f"\n📊 {totals['tests']} tests, {totals['failures']} failures, "
+          f"{totals['errors']} errors, {totals['skipped']} skipped in {elapsed:.1f}s")
+    render(events_paths, HTML_REPORT)
+    history.record(read_results(events_paths))
+    history.save()
+    print(f"📊 Merged report: {MERGED_REPORT} (HTML: {HTML_REPORT})")
+    return returncode
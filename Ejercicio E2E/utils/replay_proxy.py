@@ -0,0 +1,372 @@
+# Record-and-replay reverse proxy. The browser and the API client talk to a local server
+# that stands in for BASE_URL ("/...") and API_URL ("/__api/..."). In record mode every
+# exchange is forwarded upstream and saved to a compact archive; in replay mode responses
+# come from the archive (with optional latency), so reruns need neither the public site
+# nor its latency. Upstream URLs inside pages and scripts are rewritten to the proxy.
+# Usage (from "Ejercicio E2E"): python -m utils.replay_proxy --mode replay --port 8100
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from selenium.common.exceptions import WebDriverException
+from utils import settings
+
+API_PREFIX = "/__api"
+
+# Index format; archives of another version are recorded again
+ARCHIVE_VERSION = 2
+
+# Request header naming the test that sent the request (browser via DevTools, API client
+# directly). Exchanges are keyed and replayed per test, so the order in which tests or
+# workers send their requests does not matter.
+SCOPE_HEADER = "X-E2E-Scope"
+
+# Random ids (anonymous cart cookie, cart row ids) differ on every run; within a test each
+# one is replaced by a stable placeholder (first id seen, second...) before hashing
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+# Headers that describe one hop or the encoding of the body, not the response itself
+HOP_HEADERS = {
+    "connection", "keep-alive", "transfer-encoding", "content-length", "content-encoding",
+    "proxy-authenticate", "proxy-authorization", "te", "trailer", "upgrade", "host",
+}
+
+# Request headers not forwarded: the proxy picks the encoding it can decode, and the
+# browser's proxy origin means nothing upstream
+DROPPED_REQUEST_HEADERS = {"accept-encoding", "origin", "referer", "cookie", SCOPE_HEADER.lower()}
+
+# Bodies in which upstream URLs are rewritten to proxy URLs
+TEXT_TYPES = ("text/", "javascript", "json")
+
+def mask_ids(text, labels):
+    """Replace each id by its placeholder in labels ({id: "<uuid-N>"}), adding new ones in order"""
+    return UUID_PATTERN.sub(
+        lambda match: labels.setdefault(match.group(0).lower(), f"<uuid-{len(labels) + 1}>"), text
+    )
+
+def request_key(scope, method, path, body, labels):
+    """
+    Lookup key of an exchange: the test that sent it, then method, path with query and a hash
+    of the body, ids masked with the test's placeholders. Scope and request are tab-separated.
+    """
+    masked = mask_ids((body or b"").decode("utf-8", "replace"), labels)
+    try:
+        masked = json.dumps(json.loads(masked), sort_keys=True)
+    except ValueError:
+        pass
+    digest = hashlib.sha1(masked.encode("utf-8")).hexdigest()[:16] if masked else "-"
+    return f"{scope}\t{method} {mask_ids(path, labels)} {digest}"
+
+class ReplayArchive:
+    """
+    Exchanges in two files: <path>.data holds zlib-compressed bodies, each stored once, and
+    <path>.index.json maps request keys to their responses (status, headers, body offset).
+    Repeated requests of a test replay its recorded responses in order; the last one then
+    repeats. A request its test never sent when recording (e.g. a file the browser had
+    cached then) gets the first response any test recorded for it.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._fallbacks = {}
+        self._blobs = {}
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self._data = None
+    
+    @property
+    def index_path(self):
+        return f"{self.path}.index.json"
+    
+    @property
+    def data_path(self):
+        return f"{self.path}.data"
+    
+    def open_for_recording(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._data = open(self.data_path, "wb")
+        self.entries, self._blobs = {}, {}
+    
+    def load(self):
+        """Read the index; returns False when there is no archive"""
+        try:
+            with open(self.index_path, encoding="utf-8") as index_file:
+                index = json.load(index_file)
+            if index.get("version") != ARCHIVE_VERSION:
+                return False
+            self.entries = index["entries"]
+        except (OSError, ValueError, KeyError):
+            return False
+        self._fallbacks = {}
+        for key, responses in self.entries.items():
+            self._fallbacks.setdefault(key.split("\t", 1)[-1], responses[0])
+        self._data = open(self.data_path, "rb")
+        return True
+    
+    def add(self, key, status, headers, body):
+        with self._lock:
+            digest = hashlib.sha1(body).hexdigest()
+            if digest not in self._blobs:
+                compressed = zlib.compress(body, 6)
+                self._blobs[digest] = [self._data.tell(), len(compressed)]
+                self._data.write(compressed)
+            entry = {"status": status, "headers": headers, "body": self._blobs[digest]}
+            responses = self.entries.setdefault(key, [])
+            # Identical consecutive responses (static files, unchanged carts) are kept once
+            if not responses or responses[-1] != entry:
+                responses.append(entry)
+    
+    def next_response(self, key):
+        """Next recorded (status, headers, body) for the key, or None"""
+        with self._lock:
+            responses = self.entries.get(key)
+            if responses:
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = min(cursor + 1, len(responses) - 1)
+                entry = responses[cursor]
+            else:
+                entry = self._fallbacks.get(key.split("\t", 1)[-1])
+                if entry is None:
+                    return None
+            offset, length = entry["body"]
+            self._data.seek(offset)
+            body = zlib.decompress(self._data.read(length))
+        return entry["status"], entry["headers"], body
+    
+    def close(self):
+        with self._lock:
+            if self._data is None:
+                return
+            recording = self._data.mode == "wb"
+            self._data.close()
+            self._data = None
+            if recording:
+                tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as index_file:
+                    json.dump({"version": ARCHIVE_VERSION, "entries": self.entries}, index_file)
+                os.replace(tmp_path, self.index_path)
+
+class ProxyRequestHandler(BaseHTTPRequestHandler):
+    """Answers every request from the archive (replay) or from upstream (record)"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _handle(self):
+        proxy = self.server.proxy
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        key = proxy.request_key(self.headers.get(SCOPE_HEADER, ""), self.command, self.path, body)
+        
+        if proxy.mode == "replay":
+            if proxy.latency_ms:
+                time.sleep(proxy.latency_ms / 1000)
+            response = proxy.archive.next_response(key)
+            proxy.count("hits" if response else "misses")
+            if response is None:
+                self._send(504, {"Content-Type": "application/json"}, b'{"errorMessage": "Not in replay archive"}')
+                return
+        else:
+            try:
+                response = proxy.forward(self.command, self.path, self.headers, body)
+            except requests.RequestException as e:
+                self._send(502, {"Content-Type": "text/plain"}, str(e).encode("utf-8"))
+                return
+            proxy.archive.add(key, *response)
+            proxy.count("recorded")
+        self._send(*response)
+    
+    def _send(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+    
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = _handle
+
+class ProxyServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+class ReplayProxy:
+    """Reverse proxy for BASE_URL and API_URL in "record" or "replay" mode"""
+    
+    def __init__(self, mode, archive_path, base_url, api_url, latency_ms=0, host="127.0.0.1", port=0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown proxy mode '{mode}' (use 'record' or 'replay')")
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.upstream_base = base_url.rstrip("/")
+        self.upstream_api = api_url.rstrip("/")
+        self.archive = ReplayArchive(archive_path)
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0}
+        self._stats_lock = threading.Lock()
+        self._labels = {}
+        self._session = requests.Session()
+        self.server = ProxyServer((host, port), ProxyRequestHandler)
+        self.server.proxy = self
+        self._thread = None
+    
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+    
+    @property
+    def api_url(self):
+        return self.base_url.rstrip("/") + API_PREFIX
+    
+    def count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+    
+    def request_key(self, scope, method, path, body):
+        """Archive key of a request, with ids numbered per scope in the order the test sent them"""
+        with self._stats_lock:
+            return request_key(scope, method, path, body, self._labels.setdefault(scope, {}))
+    
+    def forward(self, method, path, headers, body):
+        """Send the request upstream; returns (status, headers, body) with URLs rewritten"""
+        if path == API_PREFIX or path.startswith(API_PREFIX + "/"):
+            url = self.upstream_api + path[len(API_PREFIX):]
+        else:
+            url = self.upstream_base + path
+        forwarded = {
+            name: value for name, value in headers.items()
+            if name.lower() not in HOP_HEADERS and name.lower() not in DROPPED_REQUEST_HEADERS
+        }
+        response = self._session.request(
+            method, url, headers=forwarded, data=body or None,
+            timeout=settings.API_TIMEOUT, allow_redirects=False
+        )
+        # Cookies are set by the store's scripts; upstream cookies are scoped to its domain
+        response_headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in HOP_HEADERS and name.lower() != "set-cookie"
+        }
+        content = response.content
+        content_type = response.headers.get("Content-Type", "")
+        if any(kind in content_type for kind in TEXT_TYPES):
+            content = self.rewrite(content)
+        if "Location" in response_headers:
+            response_headers["Location"] = self.rewrite(response_headers["Location"].encode("utf-8")).decode("utf-8")
+        return response.status_code, response_headers, content
+    
+    def rewrite(self, content):
+        """Point upstream URLs in a page or script at the proxy (API first, it may live under the base)"""
+        proxy_base = self.base_url.rstrip("/").encode("utf-8")
+        content = content.replace(self.upstream_api.encode("utf-8"), proxy_base + API_PREFIX.encode("utf-8"))
+        return content.replace(self.upstream_base.encode("utf-8"), proxy_base)
+    
+    def start(self):
+        """Start serving; returns the proxy's base URL"""
+        if self.mode == "replay":
+            if not self.archive.load():
+                raise FileNotFoundError(
+                    f"No replay archive (version {ARCHIVE_VERSION}) at {self.archive.index_path} (record one first)"
+                )
+        else:
+            self.archive.open_for_recording()
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.archive.close()
+        if self.mode == "replay":
+            print(f"🎞️ Replay proxy: {self.stats['hits']} responses replayed, {self.stats['misses']} not in archive")
+        else:
+            print(f"🎞️ Record proxy: {self.stats['recorded']} exchanges recorded to {self.archive.path}")
+
+_proxy = None
+_proxy_lock = threading.Lock()
+
+def ensure_proxy():
+    """
+    Start the proxy configured by E2E_PROXY once per process and point BASE_URL/API_URL at it.
+    Returns the running proxy, or None when proxying is off.
+    """
+    global _proxy
+    if not settings.PROXY_MODE:
+        return None
+    if settings.PROXY_MODE == "record" and settings.WORKER_ID:
+        # Workers only start their own proxy with the local store, and concurrent recorders
+        # would overwrite each other's archive
+        raise RuntimeError("Record mode needs a serial run, or --workers without E2E_LOCAL_STORE (one shared proxy)")
+    with _proxy_lock:
+        if _proxy is None:
+            proxy = ReplayProxy(
+                settings.PROXY_MODE, settings.PROXY_ARCHIVE, settings.BASE_URL, settings.API_URL,
+                latency_ms=settings.PROXY_LATENCY_MS
+            )
+            settings.BASE_URL = proxy.start()
+            settings.API_URL = proxy.api_url
+            _proxy = proxy
+            print(f"🎞️ {settings.PROXY_MODE.capitalize()} proxy at {settings.BASE_URL} ({settings.PROXY_ARCHIVE})")
+        return _proxy
+
+_scope = ""
+
+def scoping_enabled():
+    """True when requests go through a proxy (this process's or the parallel runner's)"""
+    return bool(settings.PROXY_MODE or settings.PROXY_SHARED)
+
+def set_scope(scope):
+    """Name the test whose requests follow (API client and browsers scoped with scope_driver)"""
+    global _scope
+    _scope = scope
+
+def scope_headers():
+    """Headers the API client adds so the proxy files its requests under the current test"""
+    return {SCOPE_HEADER: _scope} if scoping_enabled() and _scope else {}
+
+def scope_driver(driver):
+    """Make the browser send the current test's scope header with every request"""
+    if not scoping_enabled():
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {SCOPE_HEADER: _scope} if _scope else {}})
+    except (AttributeError, WebDriverException) as e:
+        print(f"⚠️ Could not scope browser requests for the proxy: {e}")
+
+def stop_proxy():
+    global _proxy
+    with _proxy_lock:
+        if _proxy is not None:
+            _proxy.stop()
+            _proxy = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay proxy for the E2E store")
+    parser.add_argument("--mode", choices=("record", "replay"), default="replay")
+    parser.add_argument("--archive", default=settings.PROXY_ARCHIVE)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=int, default=settings.PROXY_LATENCY_MS)
+    args = parser.parse_args()
+    
+    proxy = ReplayProxy(args.mode, args.archive, settings.BASE_URL, settings.API_URL, args.latency_ms, port=args.port)
+    proxy.start()
+    print(f"🎞️ {args.mode.capitalize()} proxy running at {proxy.base_url} (API: {proxy.api_url})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        proxy.stop()
+
+if __name__ == "__main__":
+    main()
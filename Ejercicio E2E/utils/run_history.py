@@ -0,0 +1,97 @@
+# Per-test duration and failure history, fed from the result store after every run and used
+# to schedule the next one: recently failed tests first, then longest first, in shards
+# balanced by expected duration instead of by test count
+import json
+import os
+from utils import settings
+
+def _base_id(nodeid):
+    """Node id without its parameter suffix (test_x[a] -> test_x)"""
+    return nodeid.split("[", 1)[0]
+
+class RunHistory:
+    """Exponential moving average of each test's duration plus the run it last failed in"""
+    
+    def __init__(self, path=None):
+        self.path = settings.HISTORY_PATH if path is None else path
+        self.runs = 0
+        self.tests = {}
+        self._read()
+    
+    @property
+    def enabled(self):
+        return bool(self.path)
+    
+    def _read(self):
+        if not self.enabled:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as history_file:
+                data = json.load(history_file)
+            self.runs, self.tests = data["runs"], data["tests"]
+        except (OSError, ValueError, KeyError):
+            self.runs, self.tests = 0, {}
+    
+    def save(self):
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Write then rename so a concurrent run never reads a half-written file
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as history_file:
+                json.dump({"runs": self.runs, "tests": self.tests}, history_file, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not write run history: {e}")
+    
+    def record(self, results):
+        """Fold one run's test_end events into the history; returns how many were recorded"""
+        self.runs += 1
+        recorded = 0
+        for result in results:
+            if result["outcome"] == "skipped":
+                continue
+            entry = self.tests.setdefault(result["nodeid"], {"duration": result["duration"], "samples": 0, "failed_run": None})
+            if entry["samples"]:
+                entry["duration"] += settings.HISTORY_ALPHA * (result["duration"] - entry["duration"])
+            entry["duration"] = round(entry["duration"], 3)
+            entry["samples"] += 1
+            entry["outcome"] = result["outcome"]
+            if result["outcome"] in ("failed", "error"):
+                entry["failed_run"] = self.runs
+            recorded += 1
+        return recorded
+    
+    def expected_duration(self, nodeid):
+        """Expected seconds: the test's own average, else its other parameters', else the suite median"""
+        if nodeid in self.tests:
+            return self.tests[nodeid]["duration"]
+        siblings = [entry["duration"] for test, entry in self.tests.items() if _base_id(test) == _base_id(nodeid)]
+        if siblings:
+            return sum(siblings) / len(siblings)
+        known = sorted(entry["duration"] for entry in self.tests.values())
+        return known[len(known) // 2] if known else 0.0
+    
+    def recently_failed(self, nodeid):
+        """True if the test failed in one of the last HISTORY_FAILED_RUNS recorded runs"""
+        failed_run = self.tests.get(nodeid, {}).get("failed_run")
+        return failed_run is not None and self.runs - failed_run < settings.HISTORY_FAILED_RUNS
+    
+    def order(self, tests):
+        """Recently failed tests first, then the rest, each group longest first"""
+        return sorted(tests, key=lambda test: (not self.recently_failed(test), -self.expected_duration(test)))
+    
+    def shard(self, tests, workers):
+        """
+        Longest-processing-time-first: each test, in order(), goes to the worker with the
+        least expected work so far. Returns the non-empty shards and their expected seconds.
+        """
+        shards = [[] for _ in range(workers)]
+        loads = [0.0] * workers
+        for test in self.order(tests):
+            # Ties (e.g. no history yet) go to the shard with fewer tests, i.e. round-robin
+            worker = min(range(workers), key=lambda index: (loads[index], len(shards[index])))
+            shards[worker].append(test)
+            loads[worker] += self.expected_duration(test)
+        return [(shard, load) for shard, load in zip(shards, loads) if shard]
@@ -0,0 +1,123 @@
+# Runtime settings for the E2E suite (overridable through environment variables)
+import os
+
+
+def _env_bool(name, default=False):
+    """Read a boolean flag from the environment"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name, default):
+    """Read a float from the environment"""
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name, default):
+    """Read an integer from the environment"""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Store under test
+BASE_URL = os.environ.get("E2E_BASE_URL", "https://www.demoblaze.com/")
+API_URL = os.environ.get("E2E_API_URL", "https://api.demoblaze.com")
+API_TIMEOUT = _env_int("E2E_API_TIMEOUT", 15)
+
+# Local stand-in store (local_store/): replaces BASE_URL/API_URL for the session when enabled
+LOCAL_STORE = _env_bool("E2E_LOCAL_STORE")
+LOCAL_STORE_LATENCY_MS = _env_int("E2E_LOCAL_STORE_LATENCY_MS", 0)
+
+# Record/replay proxy (utils/replay_proxy.py): "record" saves every exchange with BASE_URL and
+# API_URL to the archive, "replay" serves them back from it with the given latency; empty = off
+PROXY_MODE = os.environ.get("E2E_PROXY", "").strip().lower()
+PROXY_ARCHIVE = os.environ.get("E2E_PROXY_ARCHIVE", os.path.join("recordings", "demoblaze"))
+PROXY_LATENCY_MS = _env_int("E2E_PROXY_LATENCY_MS", 0)
+# Set by the parallel runner to its proxy's mode for workers that go through that shared proxy
+PROXY_SHARED = os.environ.get("E2E_PROXY_SHARED", "").strip().lower()
+
+# Browser
+HEADLESS = _env_bool("HEADLESS")
+
+# Network profile: "lean" blocks images/fonts/media/trackers and uses the eager page-load
+# strategy, "full" loads everything like a regular browser
+NETWORK_PROFILE = os.environ.get("E2E_NETWORK_PROFILE", "lean")
+
+# Waits (seconds): explicit wait for things that must appear, implicit driver wait,
+# and how long a probe looks for something that may legitimately be absent
+WAIT_TIMEOUT = _env_int("E2E_WAIT_TIMEOUT", 15)
+IMPLICIT_WAIT = _env_int("E2E_IMPLICIT_WAIT", 10)
+PROBE_TIMEOUT = _env_float("E2E_PROBE_TIMEOUT", 0.5)
+
+# Dialogs: record window.alert/confirm in a queue the page objects read, instead of
+# blocking native dialogs (native handling remains the fallback)
+INTERCEPT_ALERTS = _env_bool("E2E_INTERCEPT_ALERTS")
+
+# Forms: type real keystrokes field by field instead of the batched fill
+HUMAN_TYPING = _env_bool("E2E_HUMAN_TYPING")
+
+# Browser pool: how many tests a browser serves before it is relaunched
+MAX_TESTS_PER_BROWSER = _env_int("E2E_MAX_TESTS_PER_BROWSER", 20)
+
+# Browser pool: spare browsers launched in the background when a browser is about to be
+# recycled (0 disables)
+WARM_BROWSERS = _env_int("E2E_WARM_BROWSERS", 1)
+
+# Parallel runner: id of this worker process (empty when running serially)
+WORKER_ID = os.environ.get("E2E_WORKER_ID", "")
+
+# Parallel runner: memory budget per worker browser when sizing the worker count
+BROWSER_MEMORY_MB = _env_int("E2E_BROWSER_MEMORY_MB", 600)
+
+# Network capture: API endpoints whose JSON responses page objects can read (comma-separated,
+# off by default since it turns on the DevTools log, e.g. "viewcart,view") and how many
+# responses the in-memory buffer keeps per browser
+CAPTURE_ENDPOINTS = [
+    endpoint.strip()
+    for endpoint in os.environ.get("E2E_CAPTURE_ENDPOINTS", "").split(",")
+    if endpoint.strip()
+]
+CAPTURE_BUFFER = _env_int("E2E_CAPTURE_BUFFER", 200)
+
+# Wait engine: how long network and DOM must stay quiet before a page counts as ready
+QUIET_MS = _env_int("E2E_QUIET_MS", 250)
+
+# Driver resolution cache (set E2E_DRIVER_CACHE to an empty value to disable it)
+DRIVER_CACHE_PATH = os.environ.get(
+    "E2E_DRIVER_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "demoblaze-e2e", "driver_cache.json")
+)
+
+# Page performance metrics: one JSON line per page transition, appended across runs (empty
+# disables them), and budgets checked at the end of the session, e.g. "cart.p95=2500,
+# home.fcp_ms.p95=1500" (page_ms when no metric is named)
+PAGE_METRICS_FILE = os.environ.get("E2E_PAGE_METRICS_FILE", os.path.join("reports", "page_metrics.jsonl"))
+PAGE_BUDGETS = [budget.strip() for budget in os.environ.get("E2E_PAGE_BUDGETS", "").split(",") if budget.strip()]
+# This process's page records kept in memory for the summary and budgets (the oldest are dropped past this)
+PAGE_METRICS_BUFFER = _env_int("E2E_PAGE_METRICS_BUFFER", 20000)
+
+# Timing instrumentation of page-object primitives (reports/trace.json, reports/timings.json)
+TRACE = _env_bool("E2E_TRACE", True)
+# Trace events and steps kept in memory (the oldest are dropped past this)
+TRACE_BUFFER = _env_int("E2E_TRACE_BUFFER", 20000)
+
+# Result store: JSON-lines file that receives one event per test and per step, rendered
+# on demand by utils.html_report (set E2E_EVENTS_FILE empty to disable it)
+EVENTS_FILE = os.environ.get("E2E_EVENTS_FILE", os.path.join("reports", "events.jsonl"))
+
+# Run history for scheduling: per-test duration averages and recent failures, updated after
+# every run (set E2E_HISTORY_FILE empty to disable it). ALPHA weighs the newest duration;
+# tests that failed in the last FAILED_RUNS runs are scheduled first.
+HISTORY_PATH = os.environ.get(
+    "E2E_HISTORY_FILE",
+    os.path.join(os.path.expanduser("~"), ".cache", "demoblaze-e2e", "run_history.json")
+)
+HISTORY_ALPHA = _env_float("E2E_HISTORY_ALPHA", 0.3)
+HISTORY_FAILED_RUNS = _env_int("E2E_HISTORY_FAILED_RUNS", 3)
@@ -0,0 +1,27 @@
+# Small statistics helpers shared by benchmarks, load runs and page metrics
+import math
+
+def percentile(values, pct):
+    """Percentile (0-100) with linear interpolation; None for an empty list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def summarize(values, percentiles=(50, 90, 95, 99)):
+    """Count, mean, min, max and percentiles of a list of numbers"""
+    if not values:
+        return {"count": 0}
+    summary = {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "min": min(values),
+        "max": max(values),
+    }
+    for pct in percentiles:
+        summary[f"p{pct}"] = percentile(values, pct)
+    return summary
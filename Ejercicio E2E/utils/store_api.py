@@ -0,0 +1,104 @@
+# Store backend client and cart seeding, so tests can start at the cart without UI navigation
+import uuid
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selenium.common.exceptions import WebDriverException
+from utils import settings
+from utils.replay_proxy import scope_headers
+
+class StoreApiClient:
+    """Client for the store backend endpoints over a pooled, keep-alive HTTP session"""
+    
+    def __init__(self, api_url=None, pool_size=10):
+        self.api_url = (api_url or settings.API_URL).rstrip("/")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._products = None
+    
+    def _request(self, method, path, payload=None):
+        response = self.session.request(
+            method, f"{self.api_url}/{path}", json=payload, timeout=settings.API_TIMEOUT,
+            headers=scope_headers()
+        )
+        response.raise_for_status()
+        return response.json() if response.content else None
+    
+    def list_products(self):
+        """Every product in the catalog, following the pagination behind the "Next" button"""
+        if self._products is None:
+            page = self._request("GET", "entries")
+            products = list(page.get("Items", []))
+            while page.get("LastEvaluatedKey"):
+                page = self._request("POST", "pagination", {"id": page["LastEvaluatedKey"]["id"]})
+                items = page.get("Items", [])
+                if not items:
+                    break
+                products.extend(items)
+            self._products = products
+        return self._products
+    
+    def product_id(self, product_name):
+        """Catalog id of a product by its exact title"""
+        for product in self.list_products():
+            if product["title"] == product_name:
+                return product["id"]
+        raise ValueError(f"Product {product_name} not found in store catalog")
+    
+    def add_to_cart(self, cookie, product_id, logged_in=False):
+        """Add a product to the cart owned by an anonymous user id or a login token"""
+        self._request("POST", "addtocart", {
+            "id": str(uuid.uuid4()),
+            "cookie": cookie,
+            "prod_id": int(product_id),
+            "flag": logged_in,
+        })
+    
+    def view_cart(self, cookie, logged_in=False):
+        """Raw cart rows for an anonymous user id or a login token"""
+        return self._request("POST", "viewcart", {"cookie": cookie, "flag": logged_in}).get("Items", [])
+    
+    def close(self):
+        self.session.close()
+
+class CartSeeder:
+    """Puts products in the browser's cart through the backend instead of the UI"""
+    
+    # Anonymous carts are keyed on this cookie, set by the storefront scripts
+    USER_COOKIE = "user"
+    
+    def __init__(self, client=None, base_url=None):
+        self.client = client or StoreApiClient()
+        self.base_url = base_url or settings.BASE_URL
+    
+    def attach_user(self, driver):
+        """Give the browser a fresh anonymous cart id and return it"""
+        user_id = str(uuid.uuid4())
+        # DevTools sets the cookie for the store's URL without loading anything
+        try:
+            driver.execute_cdp_cmd("Network.deleteCookies", {"name": self.USER_COOKIE, "url": self.base_url})
+            driver.execute_cdp_cmd("Network.setCookie", {
+                "name": self.USER_COOKIE, "value": user_id, "url": self.base_url, "path": "/"
+            })
+            return user_id
+        except (AttributeError, WebDriverException):
+            pass
+        # WebDriver only sets cookies for the page's origin: open the store first
+        if not driver.current_url.startswith(self.base_url):
+            driver.get(self.base_url)
+        driver.delete_cookie(self.USER_COOKIE)
+        driver.add_cookie({"name": self.USER_COOKIE, "value": user_id, "path": "/"})
+        return user_id
+    
+    def seed_cart(self, driver, product_names):
+        """Add the named products to the browser's cart; returns the anonymous cart id"""
+        print(f"      → Sembrando carrito vía API: {', '.join(product_names)}")
+        user_id = self.attach_user(driver)
+        for name in product_names:
+            self.client.add_to_cart(user_id, self.client.product_id(name))
+        return user_id
@@ -0,0 +1,163 @@
+# Low-overhead timing of page-object primitives, rolled up into named test steps
+# and exported as a Chrome trace (chrome://tracing, Perfetto) and a JSON summary
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from utils import settings
+
+# Where the time inside a primitive goes
+PHASES = ("wait", "command")
+
+class Tracer:
+    """
+    Records primitive calls, their wait/command phases and the steps they belong to. Only the
+    last max_events trace events and steps are kept, so long runs stay flat in memory; the
+    current test and step are per thread.
+    """
+    
+    def __init__(self, enabled=True, max_events=None):
+        self.enabled = enabled
+        max_events = settings.TRACE_BUFFER if max_events is None else max_events
+        self.events = deque(maxlen=max_events)
+        self.steps = deque(maxlen=max_events)
+        self.steps_closed = 0
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self.step_listeners = []
+    
+    @property
+    def _test(self):
+        return getattr(self._local, "test", None)
+    
+    @_test.setter
+    def _test(self, name):
+        self._local.test = name
+    
+    @property
+    def _step(self):
+        return getattr(self._local, "step", None)
+    
+    @_step.setter
+    def _step(self, step):
+        self._local.step = step
+    
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+    
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+    
+    def _event(self, name, category, start_us, duration_us, **args):
+        self.events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": round(start_us, 1), "dur": round(duration_us, 1),
+            "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+        })
+    
+    # Tests and steps
+    
+    def begin_test(self, name):
+        """Start timing a test; time before its first step goes to an implicit setup step"""
+        self._test = name
+        self.start_step("(setup)")
+    
+    def start_step(self, name):
+        """Close the current step and open a new one"""
+        self._close_step()
+        self._step = {"test": self._test, "step": name, "start": self._now_us(), "calls": 0}
+        self._step.update({phase: 0.0 for phase in PHASES})
+        for listener in self.step_listeners:
+            listener(self._test, name)
+    
+    def end_test(self):
+        self._close_step()
+        self._test = None
+    
+    def _close_step(self):
+        step, self._step = self._step, None
+        if step is None:
+            return
+        end = self._now_us()
+        step["total"] = end - step.pop("start")
+        self.steps.append(step)
+        self.steps_closed += 1
+        self._event(step["step"], "step", end - step["total"], step["total"], test=step["test"])
+    
+    # Primitives and phases
+    
+    def primitive(self, func):
+        """Decorator that times a page-object primitive"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            stack = self._stack()
+            stack.append(func.__name__)
+            start = self._now_us()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = self._now_us() - start
+                stack.pop()
+                self._event(func.__name__, "primitive", start, duration)
+                if not stack and self._step is not None:
+                    self._step["calls"] += 1
+        return wrapper
+    
+    @contextmanager
+    def phase(self, kind):
+        """Attribute the enclosed time to a phase (wait or command) of the current step"""
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            duration = self._now_us() - start
+            stack = self._stack()
+            self._event(kind, "phase", start, duration, primitive=stack[-1] if stack else None)
+            if self._step is not None:
+                self._step[kind] += duration
+    
+    # Export
+    
+    def steps_since(self, mark):
+        """Steps closed after steps_closed was mark (those still kept)"""
+        count = min(self.steps_closed - mark, len(self.steps))
+        return list(self.steps)[len(self.steps) - count:] if count > 0 else []
+    
+    def summary(self, steps=None):
+        """Per-step rows with times in milliseconds (all steps by default)"""
+        return [
+            {
+                "test": step["test"], "step": step["step"], "calls": step["calls"],
+                **{phase: round(step[phase] / 1000, 1) for phase in PHASES},
+                "total": round(step["total"] / 1000, 1),
+            }
+            for step in (self.steps if steps is None else steps)
+        ]
+    
+    def export(self, directory="reports"):
+        """Write the Chrome trace and the step summary; returns the trace path"""
+        suffix = f"-{settings.WORKER_ID}" if settings.WORKER_ID else ""
+        os.makedirs(directory, exist_ok=True)
+        trace_path = os.path.join(directory, f"trace{suffix}.json")
+        with open(trace_path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, trace_file)
+        with open(os.path.join(directory, f"timings{suffix}.json"), "w", encoding="utf-8") as summary_file:
+            json.dump(self.summary(), summary_file, indent=2, ensure_ascii=False)
+        return trace_path
+
+tracer = Tracer(enabled=settings.TRACE)
+
+def step(title):
+    """Print a step banner and start timing it"""
+    print("\n" + title)
+    tracer.start_step(title.strip())
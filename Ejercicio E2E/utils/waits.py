@@ -0,0 +1,102 @@
+# Readiness conditions for the wait engine used by BasePage
+from selenium.common.exceptions import WebDriverException
+from utils import settings
+
+# Tracks in-flight XHR/fetch requests and DOM mutations. Installed before page scripts
+# run (CDP) when possible, otherwise injected on demand by the conditions below.
+INSTRUMENTATION_SCRIPT = """
+(function () {
+    if (window.__e2eWait) { return; }
+    var state = window.__e2eWait = {pending: 0, lastRequest: Date.now(), lastMutation: Date.now()};
+    var done = function () { state.pending = Math.max(0, state.pending - 1); state.lastRequest = Date.now(); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        state.lastRequest = Date.now();
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            state.lastRequest = Date.now();
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    new MutationObserver(function () { state.lastMutation = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+# Returns the readiness snapshot of the current document in a single round trip
+_STATE_SCRIPT = INSTRUMENTATION_SCRIPT + """
+var state = window.__e2eWait, now = Date.now();
+return {
+    readyState: document.readyState,
+    pending: state.pending,
+    sinceRequest: now - state.lastRequest,
+    sinceMutation: now - state.lastMutation
+};
+"""
+
+def _page_state(driver):
+    try:
+        return driver.execute_script(_STATE_SCRIPT)
+    except WebDriverException:
+        # Document is being replaced (navigation in progress)
+        return None
+
+class network_idle:
+    """No XHR/fetch in flight and none finished within the quiet window"""
+    
+    def __init__(self, quiet_ms=None):
+        self.quiet_ms = settings.QUIET_MS if quiet_ms is None else quiet_ms
+    
+    def __call__(self, driver):
+        state = _page_state(driver)
+        return bool(state) and state["readyState"] == "complete" \
+            and state["pending"] == 0 and state["sinceRequest"] >= self.quiet_ms
+
+class dom_stable:
+    """No DOM mutation within the quiet window"""
+    
+    def __init__(self, quiet_ms=None):
+        self.quiet_ms = settings.QUIET_MS if quiet_ms is None else quiet_ms
+    
+    def __call__(self, driver):
+        state = _page_state(driver)
+        return bool(state) and state["readyState"] != "loading" \
+            and state["sinceMutation"] >= self.quiet_ms
+
+class page_settled:
+    """Network idle and DOM stable, checked in a single round trip"""
+    
+    def __init__(self, quiet_ms=None):
+        self.quiet_ms = settings.QUIET_MS if quiet_ms is None else quiet_ms
+    
+    def __call__(self, driver):
+        state = _page_state(driver)
+        return bool(state) and state["readyState"] == "complete" and state["pending"] == 0 \
+            and state["sinceRequest"] >= self.quiet_ms and state["sinceMutation"] >= self.quiet_ms
+
+class element_has_text:
+    """Element is present and its text is not empty"""
+    
+    def __init__(self, locator):
+        self.locator = locator
+    
+    def __call__(self, driver):
+        try:
+            element = driver.find_element(*self.locator)
+            return element if element.text.strip() else False
+        except WebDriverException:
+            return False
+
+def install_instrumentation(driver):
+    """Register the instrumentation to run before page scripts on every new document"""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTRUMENTATION_SCRIPT})
+        return True
+    except (AttributeError, WebDriverException):
+        return False